@@ -3,12 +3,42 @@ AI Client Module - Wrapper for Google Gemini Flash 2.5 API.
 All AI operations are centralized here for clean architecture.
 """
 
+import asyncio
+import io
 import json
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from typing import Dict, List, Any, Coroutine, Iterator, Optional
 from google import genai
 from google.genai import types
 
-from config import GEMINI_API_KEY, MODEL_NAME, TEMPERATURE, MAX_OUTPUT_TOKENS
+from config import (
+    GEMINI_API_KEY, MODEL_NAME, TEMPERATURE, MAX_OUTPUT_TOKENS,
+    SENTIMENT_CATEGORIES, EMOTION_CATEGORIES,
+    BATCH_POLL_INTERVAL_SECONDS, BATCH_TIMEOUT_SECONDS
+)
+
+# Batch job states after which polling stops
+BATCH_FINAL_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"
+}
+
+# Structured output for chat_with_sentiment; the analysis fields come first so
+# the model classifies the message before writing the reply
+CHAT_WITH_SENTIMENT_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={
+        "sentiment": types.Schema(type=types.Type.STRING, enum=SENTIMENT_CATEGORIES),
+        "confidence": types.Schema(type=types.Type.NUMBER),
+        "emotion": types.Schema(type=types.Type.STRING, enum=EMOTION_CATEGORIES),
+        "emotion_intensity": types.Schema(type=types.Type.STRING, enum=["low", "medium", "high"]),
+        "reasoning": types.Schema(type=types.Type.STRING),
+        "reply": types.Schema(type=types.Type.STRING),
+    },
+    required=["sentiment", "confidence", "emotion", "emotion_intensity", "reasoning", "reply"],
+    property_ordering=["sentiment", "confidence", "emotion", "emotion_intensity", "reasoning", "reply"],
+)
 
 
 class GeminiAIClient:
@@ -24,15 +54,21 @@ class GeminiAIClient:
         
         # Initialize the client
         self.client = genai.Client(api_key=self.api_key)
-        
-    def _generate_content(self, prompt: str, temperature: float = None) -> str:
+
+        # Background event loop for async calls, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    def _generate_content(self, prompt: str, temperature: float = None,
+                          response_schema: types.Schema = None) -> str:
         """
         Core method to generate content from Gemini API.
-        
+
         Args:
             prompt: The input prompt for the AI
             temperature: Creativity level (0.0 - 1.0)
-            
+            response_schema: Optional schema; the response is then JSON text
+
         Returns:
             Generated text response
         """
@@ -40,15 +76,74 @@ class GeminiAIClient:
             response = self.client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=temperature or TEMPERATURE,
-                    max_output_tokens=MAX_OUTPUT_TOKENS,
-                )
+                config=self._generation_config(temperature, response_schema)
             )
             return response.text
         except Exception as e:
             raise AIClientError(f"Failed to generate content: {str(e)}")
-    
+
+    def _generate_content_stream(self, prompt: str, temperature: float = None) -> Iterator[str]:
+        """Streaming counterpart of _generate_content, yielding text as it arrives."""
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config=self._generation_config(temperature)
+            ):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise AIClientError(f"Failed to generate content: {str(e)}")
+
+    async def _generate_content_async(self, prompt: str, temperature: float = None) -> str:
+        """Async counterpart of _generate_content using the aio client."""
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=self._generation_config(temperature)
+            )
+            return response.text
+        except Exception as e:
+            raise AIClientError(f"Failed to generate content: {str(e)}")
+
+    def _generation_config(self, temperature: float = None,
+                           response_schema: types.Schema = None) -> types.GenerateContentConfig:
+        """Build the generation config shared by all requests."""
+        if response_schema is not None:
+            return types.GenerateContentConfig(
+                temperature=temperature or TEMPERATURE,
+                max_output_tokens=MAX_OUTPUT_TOKENS,
+                response_mime_type="application/json",
+                response_schema=response_schema,
+            )
+        return types.GenerateContentConfig(
+            temperature=temperature or TEMPERATURE,
+            max_output_tokens=MAX_OUTPUT_TOKENS,
+        )
+
+    def run_sync(self, coro: Coroutine) -> Any:
+        """
+        Run a coroutine to completion from synchronous code.
+
+        The aio transport keeps its connection pool bound to the event loop
+        it was first used on, so every coroutine runs on one long-lived
+        background loop rather than a fresh asyncio.run() loop per call.
+
+        Args:
+            coro: Coroutine using this client's async methods
+
+        Returns:
+            The coroutine's result
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="gemini-aio", daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
     def generate_reply(self, user_message: str, conversation_history: List[Dict] = None,
                        current_mood: str = None, sentiment_context: str = None) -> str:
         """
@@ -63,6 +158,31 @@ class GeminiAIClient:
         Returns:
             AI-generated response
         """
+        return self._generate_content(
+            self._reply_prompt(user_message, conversation_history, current_mood, sentiment_context)
+        )
+
+    def generate_reply_stream(self, user_message: str, conversation_history: List[Dict] = None,
+                              current_mood: str = None, sentiment_context: str = None) -> Iterator[str]:
+        """
+        Generate a chatbot reply, yielding pieces of it as Gemini produces them.
+
+        Args:
+            user_message: The user's input message
+            conversation_history: List of previous messages
+            current_mood: Current conversation mood
+            sentiment_context: Recent sentiment analysis results
+
+        Returns:
+            Iterator over consecutive parts of the response text
+        """
+        return self._generate_content_stream(
+            self._reply_prompt(user_message, conversation_history, current_mood, sentiment_context)
+        )
+
+    def _reply_prompt(self, user_message: str, conversation_history: Optional[List[Dict]],
+                      current_mood: Optional[str], sentiment_context: Optional[str]) -> str:
+        """Build the reply prompt shared by generate_reply and generate_reply_stream."""
         history_text = ""
         if conversation_history:
             history_text = "\n".join([
@@ -70,7 +190,7 @@ class GeminiAIClient:
                 for msg in conversation_history[-10:]  # Last 10 messages for context
             ])
         
-        prompt = f"""You are an intelligent, empathetic AI assistant. Your responses should be:
+        return f"""You are an intelligent, empathetic AI assistant. Your responses should be:
 - Natural and conversational
 - Contextually aware of the conversation history
 - Emotionally intelligent based on the user's mood
@@ -88,8 +208,64 @@ Generate a thoughtful, contextually appropriate response. If the user seems upse
 If they're happy, share in their enthusiasm. Adapt your tone based on the emotional context.
 
 YOUR RESPONSE:"""
+    
+    def chat_with_sentiment(self, user_message: str, conversation_history: List[Dict] = None,
+                            current_mood: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Analyze a message and generate the reply to it in a single API call.
+        
+        Args:
+            user_message: The user's input message
+            conversation_history: List of previous messages
+            current_mood: Conversation mood before this message
+            
+        Returns:
+            Dictionary with the analyze_sentiment fields plus "reply",
+            or None if the response could not be parsed
+        """
+        history_text = ""
+        if conversation_history:
+            history_text = "\n".join([
+                f"{msg['role'].upper()}: {msg['content']}" 
+                for msg in conversation_history[-10:]  # Last 10 messages for context
+            ])
+        
+        prompt = f"""You are an intelligent, empathetic AI assistant. First analyze the sentiment and
+emotion of the user's message, then reply to it. Your reply should be:
+- Natural and conversational
+- Contextually aware of the conversation history
+- Emotionally intelligent based on the sentiment you identified
+- Helpful and engaging
+
+CONVERSATION HISTORY:
+{history_text if history_text else "No previous conversation."}
+
+CURRENT MOOD CONTEXT: {current_mood if current_mood else "Not determined yet."}
+
+USER MESSAGE: "{user_message}"
 
-        return self._generate_content(prompt)
+Classify the sentiment (positive, negative or neutral), your confidence (0.0-1.0), the emotion,
+its intensity, and briefly explain why. Then write the reply: if the user seems upset, be more
+supportive; if they're happy, share in their enthusiasm. Adapt your tone to the emotional context."""
+
+        response = self._generate_content(prompt, response_schema=CHAT_WITH_SENTIMENT_SCHEMA)
+        if not response:
+            return None
+        
+        try:
+            result = json.loads(self._extract_json(response))
+        except json.JSONDecodeError:
+            return None
+        
+        if not isinstance(result, dict) or not isinstance(result.get("reply"), str):
+            return None
+        
+        result.setdefault("sentiment", "neutral")
+        result.setdefault("confidence", 0.5)
+        result.setdefault("emotion", "neutral")
+        result.setdefault("emotion_intensity", "medium")
+        result.setdefault("reasoning", "Analysis completed.")
+        return result
     
     def analyze_sentiment(self, message: str) -> Dict[str, Any]:
         """
@@ -157,13 +333,26 @@ ANALYSIS:"""
                 "overall_tone": "neutral",
                 "insights": "No insights available."
             }
-        
+
+        response = self._generate_content(self._summary_prompt(conversation_history), temperature=0.4)
+        return self._parse_summary(response)
+
+    async def summarize_conversation_async(self, conversation_history: List[Dict]) -> Dict[str, Any]:
+        """Async variant of summarize_conversation."""
+        if not conversation_history:
+            return self.summarize_conversation(conversation_history)
+
+        response = await self._generate_content_async(self._summary_prompt(conversation_history), temperature=0.4)
+        return self._parse_summary(response)
+
+    def _summary_prompt(self, conversation_history: List[Dict]) -> str:
+        """Build the summarization prompt for a conversation."""
         history_text = "\n".join([
-            f"{msg['role'].upper()}: {msg['content']}" 
+            f"{msg['role'].upper()}: {msg['content']}"
             for msg in conversation_history
         ])
-        
-        prompt = f"""Analyze and summarize the following conversation comprehensively.
+
+        return f"""Analyze and summarize the following conversation comprehensively.
 
 CONVERSATION:
 {history_text}
@@ -180,8 +369,8 @@ Provide your analysis in the following JSON format (respond ONLY with valid JSON
 
 ANALYSIS:"""
 
-        response = self._generate_content(prompt, temperature=0.4)
-        
+    def _parse_summary(self, response: str) -> Dict[str, Any]:
+        """Parse a summarization response, defaulting on invalid JSON."""
         try:
             json_str = self._extract_json(response)
             return json.loads(json_str)
@@ -209,13 +398,26 @@ ANALYSIS:"""
                 "themes": [],
                 "frequency_analysis": "No data to analyze."
             }
-        
+
+        response = self._generate_content(self._keywords_prompt(conversation_history), temperature=0.3)
+        return self._parse_keywords(response)
+
+    async def extract_keywords_async(self, conversation_history: List[Dict]) -> Dict[str, Any]:
+        """Async variant of extract_keywords."""
+        if not conversation_history:
+            return self.extract_keywords(conversation_history)
+
+        response = await self._generate_content_async(self._keywords_prompt(conversation_history), temperature=0.3)
+        return self._parse_keywords(response)
+
+    def _keywords_prompt(self, conversation_history: List[Dict]) -> str:
+        """Build the keyword extraction prompt for a conversation."""
         history_text = "\n".join([
-            f"{msg['role'].upper()}: {msg['content']}" 
+            f"{msg['role'].upper()}: {msg['content']}"
             for msg in conversation_history
         ])
-        
-        prompt = f"""Extract key information from the following conversation.
+
+        return f"""Extract key information from the following conversation.
 
 CONVERSATION:
 {history_text}
@@ -232,8 +434,8 @@ Provide your analysis in the following JSON format (respond ONLY with valid JSON
 
 ANALYSIS:"""
 
-        response = self._generate_content(prompt, temperature=0.3)
-        
+    def _parse_keywords(self, response: str) -> Dict[str, Any]:
+        """Parse a keyword extraction response, defaulting on invalid JSON."""
         try:
             json_str = self._extract_json(response)
             return json.loads(json_str)
@@ -260,7 +462,20 @@ ANALYSIS:"""
                 "direction": "neutral",
                 "analysis": "No sentiment data to analyze."
             }
-        
+
+        response = self._generate_content(self._trend_prompt(sentiment_history), temperature=0.4)
+        return self._parse_trend_analysis(response)
+
+    async def generate_trend_analysis_async(self, sentiment_history: List[Dict]) -> Dict[str, Any]:
+        """Async variant of generate_trend_analysis."""
+        if not sentiment_history:
+            return self.generate_trend_analysis(sentiment_history)
+
+        response = await self._generate_content_async(self._trend_prompt(sentiment_history), temperature=0.4)
+        return self._parse_trend_analysis(response)
+
+    def _trend_prompt(self, sentiment_history: List[Dict]) -> str:
+        """Build the trend analysis prompt for a sentiment history."""
         sentiment_text = "\n".join([
             f"Message {i+1}: Sentiment={s.get('sentiment', 'N/A')}, "
             f"Emotion={s.get('emotion', 'N/A')}, "
@@ -268,7 +483,7 @@ ANALYSIS:"""
             for i, s in enumerate(sentiment_history)
         ])
         
-        prompt = f"""Analyze the sentiment trend from the following conversation data.
+        return f"""Analyze the sentiment trend from the following conversation data.
 
 SENTIMENT HISTORY:
 {sentiment_text}
@@ -285,8 +500,8 @@ Provide your analysis in the following JSON format (respond ONLY with valid JSON
 
 ANALYSIS:"""
 
-        response = self._generate_content(prompt, temperature=0.4)
-        
+    def _parse_trend_analysis(self, response: str) -> Dict[str, Any]:
+        """Parse a trend analysis response, defaulting on invalid JSON."""
         try:
             json_str = self._extract_json(response)
             return json.loads(json_str)
@@ -297,19 +512,54 @@ ANALYSIS:"""
                 "analysis": response
             }
     
-    def generate_ascii_mood_graph(self, sentiment_history: List[Dict]) -> str:
+    def generate_ascii_mood_graph(self, sentiment_history: List[Dict], fallback: bool = True) -> str:
         """
         Generate an AI-created ASCII art mood graph.
         
         Args:
             sentiment_history: List of sentiment analysis results
+            fallback: Return fallback_mood_graph() on API errors or an empty
+                response instead of raising AIClientError
             
         Returns:
             ASCII art representation of mood over time
         """
         if not sentiment_history:
             return "📊 No conversation data yet.\n\nStart chatting to see your mood graph!"
-        
+
+        try:
+            result = self._generate_content(self._mood_graph_prompt(sentiment_history), temperature=0.5)
+        except AIClientError:
+            if not fallback:
+                raise
+            result = None
+        return self._mood_graph_or_fallback(result, sentiment_history, fallback)
+
+    async def generate_ascii_mood_graph_async(self, sentiment_history: List[Dict],
+                                              fallback: bool = True) -> str:
+        """Async variant of generate_ascii_mood_graph."""
+        if not sentiment_history:
+            return self.generate_ascii_mood_graph(sentiment_history)
+
+        try:
+            result = await self._generate_content_async(self._mood_graph_prompt(sentiment_history), temperature=0.5)
+        except AIClientError:
+            if not fallback:
+                raise
+            result = None
+        return self._mood_graph_or_fallback(result, sentiment_history, fallback)
+
+    def _mood_graph_or_fallback(self, result: Optional[str], sentiment_history: List[Dict],
+                                fallback: bool) -> str:
+        """Return the generated graph, or the fallback graph when there is none."""
+        if result:
+            return result
+        if not fallback:
+            raise AIClientError("Empty mood graph response")
+        return self.fallback_mood_graph(sentiment_history)
+
+    def _mood_graph_prompt(self, sentiment_history: List[Dict]) -> str:
+        """Build the ASCII mood graph prompt for a sentiment history."""
         # Build detailed sentiment data
         sentiment_text = "\n".join([
             f"Message {i+1}: {s.get('sentiment', 'neutral')} ({s.get('emotion', 'neutral')}, confidence: {s.get('confidence', 0.5):.0%})"
@@ -321,7 +571,7 @@ ANALYSIS:"""
         neg_count = sum(1 for s in sentiment_history if s.get('sentiment') == 'negative')
         neu_count = sum(1 for s in sentiment_history if s.get('sentiment') == 'neutral')
         
-        prompt = f"""Create an ASCII art mood graph for this conversation data.
+        return f"""Create an ASCII art mood graph for this conversation data.
 
 SENTIMENT DATA ({len(sentiment_history)} messages):
 {sentiment_text}
@@ -345,14 +595,8 @@ Negative  │     ●
 
 Now create the graph for the actual data:"""
 
-        try:
-            result = self._generate_content(prompt, temperature=0.5)
-            return result if result else self._fallback_mood_graph(sentiment_history)
-        except Exception as e:
-            return self._fallback_mood_graph(sentiment_history)
-    
-    def _fallback_mood_graph(self, sentiment_history: List[Dict]) -> str:
-        """Generate a simple fallback mood graph if AI fails."""
+    def fallback_mood_graph(self, sentiment_history: List[Dict]) -> str:
+        """Generate a simple text mood graph, used when the AI graph fails."""
         if not sentiment_history:
             return "No data available."
         
@@ -390,11 +634,22 @@ Now create the graph for the actual data:"""
         """
         if not sentiment_history:
             return "No data available for emotion profile."
-        
+
+        return self._generate_content(self._emotion_profile_prompt(sentiment_history), temperature=0.6)
+
+    async def generate_emotion_profile_async(self, sentiment_history: List[Dict]) -> str:
+        """Async variant of generate_emotion_profile."""
+        if not sentiment_history:
+            return self.generate_emotion_profile(sentiment_history)
+
+        return await self._generate_content_async(self._emotion_profile_prompt(sentiment_history), temperature=0.6)
+
+    def _emotion_profile_prompt(self, sentiment_history: List[Dict]) -> str:
+        """Build the emotion profile prompt for a sentiment history."""
         emotions = [s.get('emotion', 'neutral') for s in sentiment_history]
         sentiments = [s.get('sentiment', 'neutral') for s in sentiment_history]
-        
-        prompt = f"""Create a detailed emotion profile based on this conversation data.
+
+        return f"""Create a detailed emotion profile based on this conversation data.
 
 EMOTIONS DETECTED: {emotions}
 SENTIMENTS: {sentiments}
@@ -412,8 +667,128 @@ Make it insightful and professional.
 
 EMOTION PROFILE:"""
 
-        return self._generate_content(prompt, temperature=0.6)
-    
+    def batch_full_report(self, conversation_history: List[Dict], sentiment_history: List[Dict],
+                          synchronous_fallback: bool = True) -> Dict[str, Any]:
+        """
+        Run all five report analyses as a single Gemini Batch Mode job.
+        Batch jobs are billed at half the per-token price but may take up to
+        24 hours, so this is meant for offline report generation.
+
+        Args:
+            conversation_history: Full conversation history
+            sentiment_history: List of sentiment analysis results
+            synchronous_fallback: Run the analyses one by one if the batch job fails
+
+        Returns:
+            Dictionary keyed by trends, keywords, summary, mood_graph and emotion_profile
+        """
+        if not conversation_history or not sentiment_history:
+            # Empty histories short-circuit without any API call
+            return self._sequential_full_report(conversation_history, sentiment_history)
+
+        requests = {
+            "trends": (self._trend_prompt(sentiment_history), 0.4),
+            "keywords": (self._keywords_prompt(conversation_history), 0.3),
+            "summary": (self._summary_prompt(conversation_history), 0.4),
+            "mood_graph": (self._mood_graph_prompt(sentiment_history), 0.5),
+            "emotion_profile": (self._emotion_profile_prompt(sentiment_history), 0.6),
+        }
+
+        try:
+            texts = self._run_batch(requests)
+        except AIClientError:
+            if not synchronous_fallback:
+                raise
+            return self._sequential_full_report(conversation_history, sentiment_history)
+
+        mood_graph = texts["mood_graph"]
+        return {
+            "trends": self._parse_trend_analysis(texts["trends"]),
+            "keywords": self._parse_keywords(texts["keywords"]),
+            "summary": self._parse_summary(texts["summary"]),
+            "mood_graph": mood_graph if mood_graph else self.fallback_mood_graph(sentiment_history),
+            "emotion_profile": texts["emotion_profile"],
+        }
+
+    def _sequential_full_report(self, conversation_history: List[Dict],
+                                sentiment_history: List[Dict]) -> Dict[str, Any]:
+        """Run the five report analyses one request at a time."""
+        return {
+            "trends": self.generate_trend_analysis(sentiment_history),
+            "keywords": self.extract_keywords(conversation_history),
+            "summary": self.summarize_conversation(conversation_history),
+            "mood_graph": self.generate_ascii_mood_graph(sentiment_history),
+            "emotion_profile": self.generate_emotion_profile(sentiment_history),
+        }
+
+    def _run_batch(self, requests: Dict[str, tuple]) -> Dict[str, str]:
+        """
+        Submit keyed prompts as a JSONL batch job and wait for the results.
+
+        Args:
+            requests: Mapping of key to (prompt, temperature)
+
+        Returns:
+            Mapping of key to generated text
+        """
+        lines = [
+            json.dumps({
+                "key": key,
+                "request": {
+                    "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                    "generation_config": {
+                        "temperature": temperature,
+                        "max_output_tokens": MAX_OUTPUT_TOKENS,
+                    },
+                },
+            })
+            for key, (prompt, temperature) in requests.items()
+        ]
+
+        try:
+            src = self.client.files.upload(
+                file=io.BytesIO("\n".join(lines).encode("utf-8")),
+                config=types.UploadFileConfig(display_name="full-report", mime_type="jsonl"),
+            )
+            job = self.client.batches.create(
+                model=self.model_name,
+                src=src.name,
+                config={"display_name": "full-report"},
+            )
+
+            deadline = time.monotonic() + BATCH_TIMEOUT_SECONDS
+            while job.state.name not in BATCH_FINAL_STATES:
+                if time.monotonic() > deadline:
+                    raise AIClientError(f"Batch job {job.name} timed out")
+                time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+                job = self.client.batches.get(name=job.name)
+
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise AIClientError(f"Batch job {job.name} ended in {job.state.name}")
+
+            output = self.client.files.download(file=job.dest.file_name)
+
+            # Demultiplex the result lines by key; malformed output counts as a failed job
+            texts = {}
+            for line in output.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                candidates = item.get("response", {}).get("candidates", [])
+                if candidates:
+                    parts = candidates[0].get("content", {}).get("parts", [])
+                    texts[item.get("key")] = "".join(part.get("text", "") for part in parts)
+        except AIClientError:
+            raise
+        except Exception as e:
+            raise AIClientError(f"Failed to run batch job: {str(e)}")
+
+        missing = set(requests) - set(texts)
+        if missing:
+            raise AIClientError(f"Batch job returned no result for: {', '.join(sorted(missing))}")
+
+        return texts
+
     def _extract_json(self, text: str) -> str:
         """Extract JSON from a text response."""
         # Try to find JSON block
@@ -3,13 +3,50 @@ Analytics Module - AI-Powered Conversation Analytics.
 Provides trend analysis, keyword extraction, and visualizations using Gemini Flash 2.5.
 """
 
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import io
+import json
+import threading
+from collections import Counter, OrderedDict
+from math import fsum
+from typing import Dict, Any, List, Callable
 from dataclasses import dataclass
 
-from ai_client import GeminiAIClient
+from ai_client import GeminiAIClient, AIClientError
+from config import ANALYTICS_CACHE_SIZE
+from sentiment import SentimentAnalyzer
+from utils import dumps_json
 
+# Optional acceleration for create_simple_ascii_graph
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Sentinel for cache misses (cached values may themselves be falsy)
+_MISSING = object()
+
+# Static text report blocks, built once at import. Each block carries its own
+# line breaks so the report can be streamed into a buffer without a join.
+REPORT_SEPARATOR = "=" * 60
+SECTION_RULE = "-" * 40
+REPORT_HEADER = f"{REPORT_SEPARATOR}\n           CONVERSATION ANALYTICS REPORT\n{REPORT_SEPARATOR}\n\n"
+REPORT_FOOTER = f"\n{REPORT_SEPARATOR}\n           END OF REPORT\n{REPORT_SEPARATOR}"
+SUMMARY_HEADING = f"📊 CONVERSATION SUMMARY\n{SECTION_RULE}\n"
+TRENDS_HEADING = f"\n📈 SENTIMENT TRENDS\n{SECTION_RULE}\n"
+KEYWORDS_HEADING = f"\n🔑 KEYWORDS & THEMES\n{SECTION_RULE}\n"
+STATISTICS_HEADING = f"\n📉 STATISTICS\n{SECTION_RULE}\n"
+MOOD_GRAPH_HEADING = f"\n📊 MOOD VISUALIZATION\n{SECTION_RULE}\n"
+EMOTION_PROFILE_HEADING = f"\n🎭 EMOTION PROFILE\n{SECTION_RULE}\n"
+
+
+@dataclass(slots=True)
 class TrendData:
     """Data class for trend analysis results."""
     trend: str  # improving, declining, stable, volatile
@@ -36,9 +73,70 @@ class ConversationAnalytics:
     All analysis is performed using Google Gemini Flash 2.5.
     """
     
-    def __init__(self, ai_client: GeminiAIClient = None):
-        """Initialize analytics with AI client."""
+    def __init__(self, ai_client: GeminiAIClient = None,
+                 sentiment_analyzer: SentimentAnalyzer = None,
+                 cache_size: int = ANALYTICS_CACHE_SIZE):
+        """
+        Initialize analytics with AI client.
+
+        Args:
+            ai_client: Optional custom AI client
+            sentiment_analyzer: Analyzer whose running counters can stand in
+                for rescanning its sentiment history
+            cache_size: Maximum number of cached AI results
+        """
         self.ai_client = ai_client or GeminiAIClient()
+        self.sentiment_analyzer = sentiment_analyzer
+
+        # LRU cache of AI results keyed by (kind, digest of the input history),
+        # so repeat reports on an unchanged conversation skip the API entirely
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+
+    def _cache_key(self, kind: str, history: List[Dict]) -> tuple:
+        """Build a cache key from the analysis kind and a hash of its input."""
+        payload = json.dumps(history, sort_keys=True, default=str).encode("utf-8")
+        return kind, hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _cache_get(self, key: tuple) -> Any:
+        """Return a cached value (marking it recently used) or _MISSING."""
+        with self._cache_lock:
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                self._cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, key: tuple, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _cached(self, kind: str, history: List[Dict], compute: Callable) -> Any:
+        """Return compute(history), reusing the result for identical input."""
+        key = self._cache_key(kind, history)
+        value = self._cache_get(key)
+        if value is _MISSING:
+            value = compute(history)
+            self._cache_put(key, value)
+        return value
+
+    async def _cached_async(self, kind: str, history: List[Dict], compute: Callable) -> Any:
+        """Async variant of _cached for coroutine functions."""
+        key = self._cache_key(kind, history)
+        value = self._cache_get(key)
+        if value is _MISSING:
+            value = await compute(history)
+            self._cache_put(key, value)
+        return value
+
+    def clear_cache(self):
+        """Drop all cached AI results."""
+        with self._cache_lock:
+            self._cache.clear()
     
     def analyze_trends(self, sentiment_history: List[Dict]) -> TrendData:
         """
@@ -50,8 +148,16 @@ class ConversationAnalytics:
         Returns:
             TrendData with comprehensive trend analysis
         """
-        result = self.ai_client.generate_trend_analysis(sentiment_history)
-        
+        result = self._cached("trends", sentiment_history, self.ai_client.generate_trend_analysis)
+        return self._to_trend_data(result)
+
+    async def analyze_trends_async(self, sentiment_history: List[Dict]) -> TrendData:
+        """Async variant of analyze_trends."""
+        result = await self._cached_async("trends", sentiment_history, self.ai_client.generate_trend_analysis_async)
+        return self._to_trend_data(result)
+
+    def _to_trend_data(self, result: Dict[str, Any]) -> TrendData:
+        """Build TrendData from a raw trend analysis result."""
         return TrendData(
             trend=result.get("trend", "stable"),
             direction=result.get("direction", "neutral"),
@@ -71,7 +177,11 @@ class ConversationAnalytics:
         Returns:
             Dictionary with keywords, themes, and analysis
         """
-        return self.ai_client.extract_keywords(conversation_history)
+        return self._cached("keywords", conversation_history, self.ai_client.extract_keywords)
+
+    async def extract_keywords_async(self, conversation_history: List[Dict]) -> Dict[str, Any]:
+        """Async variant of extract_keywords."""
+        return await self._cached_async("keywords", conversation_history, self.ai_client.extract_keywords_async)
     
     def get_summary(self, conversation_history: List[Dict]) -> Dict[str, Any]:
         """
@@ -83,7 +193,11 @@ class ConversationAnalytics:
         Returns:
             Dictionary with summary and insights
         """
-        return self.ai_client.summarize_conversation(conversation_history)
+        return self._cached("summary", conversation_history, self.ai_client.summarize_conversation)
+
+    async def get_summary_async(self, conversation_history: List[Dict]) -> Dict[str, Any]:
+        """Async variant of get_summary."""
+        return await self._cached_async("summary", conversation_history, self.ai_client.summarize_conversation_async)
     
     def generate_mood_graph(self, sentiment_history: List[Dict]) -> str:
         """
@@ -95,7 +209,26 @@ class ConversationAnalytics:
         Returns:
             ASCII art mood visualization
         """
-        return self.ai_client.generate_ascii_mood_graph(sentiment_history)
+        # Fallback graphs aren't cached, so the next call retries the API
+        try:
+            return self._cached("mood_graph", sentiment_history, self._ai_mood_graph)
+        except AIClientError:
+            return self.ai_client.fallback_mood_graph(sentiment_history)
+
+    async def generate_mood_graph_async(self, sentiment_history: List[Dict]) -> str:
+        """Async variant of generate_mood_graph."""
+        try:
+            return await self._cached_async("mood_graph", sentiment_history, self._ai_mood_graph_async)
+        except AIClientError:
+            return self.ai_client.fallback_mood_graph(sentiment_history)
+
+    def _ai_mood_graph(self, sentiment_history: List[Dict]) -> str:
+        """Generate the AI mood graph, raising AIClientError instead of falling back."""
+        return self.ai_client.generate_ascii_mood_graph(sentiment_history, fallback=False)
+
+    async def _ai_mood_graph_async(self, sentiment_history: List[Dict]) -> str:
+        """Async variant of _ai_mood_graph."""
+        return await self.ai_client.generate_ascii_mood_graph_async(sentiment_history, fallback=False)
     
     def generate_emotion_profile(self, sentiment_history: List[Dict]) -> str:
         """
@@ -107,30 +240,84 @@ class ConversationAnalytics:
         Returns:
             Detailed emotion profile text
         """
-        return self.ai_client.generate_emotion_profile(sentiment_history)
+        return self._cached("emotion_profile", sentiment_history, self.ai_client.generate_emotion_profile)
+
+    async def generate_emotion_profile_async(self, sentiment_history: List[Dict]) -> str:
+        """Async variant of generate_emotion_profile."""
+        return await self._cached_async("emotion_profile", sentiment_history, self.ai_client.generate_emotion_profile_async)
     
-    def get_full_report(self, conversation_history: List[Dict], 
-                        sentiment_history: List[Dict]) -> Dict[str, Any]:
+    def get_full_report(self, conversation_history: List[Dict],
+                        sentiment_history: List[Dict],
+                        use_batch: bool = False,
+                        synchronous_fallback: bool = True) -> Dict[str, Any]:
         """
         Generate a complete analytics report.
-        
+
         Args:
             conversation_history: Full conversation history
             sentiment_history: List of sentiment analysis results
-            
+            use_batch: Submit all analyses as one Gemini Batch Mode job
+                (half price, but can take hours; not for interactive use)
+            synchronous_fallback: With use_batch, fall back to direct calls
+                if the batch job fails
+
         Returns:
             Comprehensive analytics report
         """
-        # Get all analytics
-        trends = self.analyze_trends(sentiment_history)
-        keywords = self.extract_keywords(conversation_history)
-        summary = self.get_summary(conversation_history)
-        mood_graph = self.generate_mood_graph(sentiment_history)
-        emotion_profile = self.generate_emotion_profile(sentiment_history)
-        
-        # Calculate statistics
+        if not use_batch:
+            return self.ai_client.run_sync(
+                self.get_full_report_async(conversation_history, sentiment_history)
+            )
+
+        parts = self.ai_client.batch_full_report(
+            conversation_history, sentiment_history,
+            synchronous_fallback=synchronous_fallback
+        )
+
+        # Seed the cache so later interactive calls reuse the batch results
+        for kind in ("keywords", "summary"):
+            self._cache_put(self._cache_key(kind, conversation_history), parts[kind])
+        for kind in ("trends", "emotion_profile"):
+            self._cache_put(self._cache_key(kind, sentiment_history), parts[kind])
+        if parts["mood_graph"] != self.ai_client.fallback_mood_graph(sentiment_history):
+            self._cache_put(self._cache_key("mood_graph", sentiment_history), parts["mood_graph"])
+
+        return {
+            "summary": parts["summary"],
+            "trends": self._to_trend_data(parts["trends"]).to_dict(),
+            "keywords": parts["keywords"],
+            "statistics": self._calculate_statistics(sentiment_history),
+            "mood_graph": parts["mood_graph"],
+            "emotion_profile": parts["emotion_profile"]
+        }
+
+    async def get_full_report_async(self, conversation_history: List[Dict],
+                                    sentiment_history: List[Dict]) -> Dict[str, Any]:
+        """
+        Generate a complete analytics report with all AI calls in flight at once.
+
+        Args:
+            conversation_history: Full conversation history
+            sentiment_history: List of sentiment analysis results
+
+        Returns:
+            Comprehensive analytics report
+        """
+        # The five analyses are independent, so wall time is the slowest call
+        pending = asyncio.gather(
+            self.analyze_trends_async(sentiment_history),
+            self.extract_keywords_async(conversation_history),
+            self.get_summary_async(conversation_history),
+            self.generate_mood_graph_async(sentiment_history),
+            self.generate_emotion_profile_async(sentiment_history),
+        )
+
+        # Let the requests go out, then calculate statistics while they run
+        await asyncio.sleep(0)
         stats = self._calculate_statistics(sentiment_history)
-        
+
+        trends, keywords, summary, mood_graph, emotion_profile = await pending
+
         return {
             "summary": summary,
             "trends": trends.to_dict(),
@@ -139,9 +326,13 @@ class ConversationAnalytics:
             "mood_graph": mood_graph,
             "emotion_profile": emotion_profile
         }
-    
+
     def _calculate_statistics(self, sentiment_history: List[Dict]) -> Dict[str, Any]:
         """Calculate basic statistics from sentiment history."""
+        # The analyzer already tracks these incrementally for its own history
+        if self.sentiment_analyzer is not None and self.sentiment_analyzer.is_current_history(sentiment_history):
+            return self.sentiment_analyzer.get_running_stats()
+
         if not sentiment_history:
             return {
                 "total_messages": 0,
@@ -150,30 +341,18 @@ class ConversationAnalytics:
                 "average_confidence": 0.0
             }
         
-        # Count sentiments
-        sentiment_dist = {}
-        emotion_dist = {}
-        total_confidence = 0.0
-        
-        for item in sentiment_history:
-            # Sentiment distribution
-            sentiment = item.get("sentiment", "neutral")
-            sentiment_dist[sentiment] = sentiment_dist.get(sentiment, 0) + 1
-            
-            # Emotion distribution
-            emotion = item.get("emotion", "neutral")
-            emotion_dist[emotion] = emotion_dist.get(emotion, 0) + 1
-            
-            # Confidence
-            total_confidence += float(item.get("confidence", 0.5))
-        
+        # Counter and fsum keep the per-item work in C
+        sentiment_dist = Counter(item.get("sentiment", "neutral") for item in sentiment_history)
+        emotion_dist = Counter(item.get("emotion", "neutral") for item in sentiment_history)
+        total_confidence = fsum(float(item.get("confidence", 0.5)) for item in sentiment_history)
+
         return {
             "total_messages": len(sentiment_history),
-            "sentiment_distribution": sentiment_dist,
-            "emotion_distribution": emotion_dist,
+            "sentiment_distribution": dict(sentiment_dist),
+            "emotion_distribution": dict(emotion_dist),
             "average_confidence": total_confidence / len(sentiment_history),
-            "dominant_sentiment": max(sentiment_dist, key=sentiment_dist.get) if sentiment_dist else "neutral",
-            "dominant_emotion": max(emotion_dist, key=emotion_dist.get) if emotion_dist else "neutral"
+            "dominant_sentiment": sentiment_dist.most_common(1)[0][0],
+            "dominant_emotion": emotion_dist.most_common(1)[0][0]
         }
 
 
@@ -186,127 +365,156 @@ class ReportGenerator:
         """Initialize report generator."""
         self.analytics = analytics or ConversationAnalytics()
     
+    def prepare_report(self, conversation_history: List[Dict],
+                       sentiment_history: List[Dict]) -> Dict[str, Any]:
+        """
+        Run the full analysis once so it can be rendered in several formats.
+        
+        Args:
+            conversation_history: Full conversation history
+            sentiment_history: List of sentiment analysis results
+            
+        Returns:
+            Full report dictionary to pass as ``report`` to the generate methods
+        """
+        return self.analytics.get_full_report(conversation_history, sentiment_history)
+    
     def generate_text_report(self, conversation_history: List[Dict],
-                             sentiment_history: List[Dict]) -> str:
+                             sentiment_history: List[Dict],
+                             report: Dict[str, Any] = None) -> str:
         """
         Generate a formatted text report.
         
         Args:
             conversation_history: Full conversation history
             sentiment_history: List of sentiment analysis results
+            report: Report from prepare_report() to reuse instead of re-analyzing
             
         Returns:
             Formatted text report
         """
-        report = self.analytics.get_full_report(conversation_history, sentiment_history)
+        if report is None:
+            report = self.prepare_report(conversation_history, sentiment_history)
         
-        lines = []
-        lines.append("=" * 60)
-        lines.append("           CONVERSATION ANALYTICS REPORT")
-        lines.append("=" * 60)
-        lines.append("")
+        buf = io.StringIO()
+        w = buf.write
+        w(REPORT_HEADER)
         
         # Summary Section
-        lines.append("📊 CONVERSATION SUMMARY")
-        lines.append("-" * 40)
         summary = report.get("summary", {})
-        lines.append(f"Summary: {summary.get('summary', 'N/A')}")
-        lines.append(f"Overall Tone: {summary.get('overall_tone', 'N/A')}")
-        lines.append(f"Mood Journey: {summary.get('user_mood_journey', 'N/A')}")
+        w(SUMMARY_HEADING)
+        w(f"Summary: {summary.get('summary', 'N/A')}\n"
+          f"Overall Tone: {summary.get('overall_tone', 'N/A')}\n"
+          f"Mood Journey: {summary.get('user_mood_journey', 'N/A')}\n")
         
         if summary.get("key_points"):
-            lines.append("\nKey Points:")
-            for point in summary.get("key_points", []):
-                lines.append(f"  • {point}")
-        
-        lines.append("")
+            w("\nKey Points:\n")
+            for point in summary["key_points"]:
+                w(f"  • {point}\n")
         
         # Trends Section
-        lines.append("📈 SENTIMENT TRENDS")
-        lines.append("-" * 40)
         trends = report.get("trends", {})
-        lines.append(f"Trend: {trends.get('trend', 'N/A')}")
-        lines.append(f"Direction: {trends.get('direction', 'N/A')}")
-        lines.append(f"Analysis: {trends.get('analysis', 'N/A')}")
-        lines.append(f"Prediction: {trends.get('prediction', 'N/A')}")
+        w(TRENDS_HEADING)
+        w(f"Trend: {trends.get('trend', 'N/A')}\n"
+          f"Direction: {trends.get('direction', 'N/A')}\n"
+          f"Analysis: {trends.get('analysis', 'N/A')}\n"
+          f"Prediction: {trends.get('prediction', 'N/A')}\n")
         
         if trends.get("mood_shifts"):
-            lines.append("\nMood Shifts:")
-            for shift in trends.get("mood_shifts", []):
-                lines.append(f"  ↔ {shift}")
-        
-        lines.append("")
+            w("\nMood Shifts:\n")
+            for shift in trends["mood_shifts"]:
+                w(f"  ↔ {shift}\n")
         
         # Keywords Section
-        lines.append("🔑 KEYWORDS & THEMES")
-        lines.append("-" * 40)
+        w(KEYWORDS_HEADING)
         keywords = report.get("keywords", {})
         
         if keywords.get("keywords"):
-            lines.append(f"Keywords: {', '.join(keywords.get('keywords', []))}")
+            w(f"Keywords: {', '.join(keywords['keywords'])}\n")
         
         if keywords.get("themes"):
-            lines.append(f"Themes: {', '.join(keywords.get('themes', []))}")
+            w(f"Themes: {', '.join(keywords['themes'])}\n")
         
         if keywords.get("topics_of_interest"):
-            lines.append(f"Topics of Interest: {', '.join(keywords.get('topics_of_interest', []))}")
-        
-        lines.append("")
+            w(f"Topics of Interest: {', '.join(keywords['topics_of_interest'])}\n")
         
         # Statistics Section
-        lines.append("📉 STATISTICS")
-        lines.append("-" * 40)
         stats = report.get("statistics", {})
-        lines.append(f"Total Messages Analyzed: {stats.get('total_messages', 0)}")
-        lines.append(f"Average Confidence: {stats.get('average_confidence', 0):.1%}")
-        lines.append(f"Dominant Sentiment: {stats.get('dominant_sentiment', 'N/A')}")
-        lines.append(f"Dominant Emotion: {stats.get('dominant_emotion', 'N/A')}")
+        w(STATISTICS_HEADING)
+        w(f"Total Messages Analyzed: {stats.get('total_messages', 0)}\n"
+          f"Average Confidence: {stats.get('average_confidence', 0):.1%}\n"
+          f"Dominant Sentiment: {stats.get('dominant_sentiment', 'N/A')}\n"
+          f"Dominant Emotion: {stats.get('dominant_emotion', 'N/A')}\n")
         
         sentiment_dist = stats.get("sentiment_distribution", {})
         if sentiment_dist:
-            lines.append("\nSentiment Distribution:")
+            w("\nSentiment Distribution:\n")
             for sentiment, count in sentiment_dist.items():
-                lines.append(f"  {sentiment.capitalize()}: {count}")
+                w(f"  {sentiment.capitalize()}: {count}\n")
         
         emotion_dist = stats.get("emotion_distribution", {})
         if emotion_dist:
-            lines.append("\nEmotion Distribution:")
+            w("\nEmotion Distribution:\n")
             for emotion, count in sorted(emotion_dist.items(), key=lambda x: -x[1])[:5]:
-                lines.append(f"  {emotion.capitalize()}: {count}")
-        
-        lines.append("")
+                w(f"  {emotion.capitalize()}: {count}\n")
         
         # Mood Graph Section
-        lines.append("📊 MOOD VISUALIZATION")
-        lines.append("-" * 40)
-        lines.append(report.get("mood_graph", "No visualization available."))
-        lines.append("")
+        w(MOOD_GRAPH_HEADING)
+        w(report.get("mood_graph", "No visualization available."))
+        w("\n")
         
         # Emotion Profile Section
-        lines.append("🎭 EMOTION PROFILE")
-        lines.append("-" * 40)
-        lines.append(report.get("emotion_profile", "No profile available."))
-        lines.append("")
+        w(EMOTION_PROFILE_HEADING)
+        w(report.get("emotion_profile", "No profile available."))
+        w("\n")
         
-        lines.append("=" * 60)
-        lines.append("           END OF REPORT")
-        lines.append("=" * 60)
-        
-        return "\n".join(lines)
+        w(REPORT_FOOTER)
+        return buf.getvalue()
     
     def generate_json_report(self, conversation_history: List[Dict],
-                             sentiment_history: List[Dict]) -> Dict[str, Any]:
+                             sentiment_history: List[Dict],
+                             report: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Generate a JSON-formatted report.
         
         Args:
             conversation_history: Full conversation history
             sentiment_history: List of sentiment analysis results
+            report: Report from prepare_report() to reuse instead of re-analyzing
             
         Returns:
             Dictionary report suitable for JSON serialization
         """
-        return self.analytics.get_full_report(conversation_history, sentiment_history)
+        if report is None:
+            report = self.prepare_report(conversation_history, sentiment_history)
+        return report
+    
+    def generate_json_bytes(self, conversation_history: List[Dict],
+                            sentiment_history: List[Dict],
+                            report: Dict[str, Any] = None) -> bytes:
+        """
+        Generate the JSON report already encoded, ready to write or send.
+        
+        Args:
+            conversation_history: Full conversation history
+            sentiment_history: List of sentiment analysis results
+            report: Report from prepare_report() to reuse instead of re-analyzing
+            
+        Returns:
+            UTF-8 encoded JSON report
+        """
+        return dumps_json(self.generate_json_report(conversation_history, sentiment_history, report))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _fill_graph(normalized, height, out):
+        """Fill out[height + 1, N] with '█' or ' ' codepoints by threshold."""
+        for r in range(height, -1, -1):
+            threshold = r / height
+            row = height - r
+            for j in range(normalized.shape[0]):
+                out[row, j] = 0x2588 if normalized[j] >= threshold else 0x20
 
 
 def create_simple_ascii_graph(values: List[float], width: int = 50, height: int = 10) -> str:
@@ -333,17 +541,30 @@ def create_simple_ascii_graph(values: List[float], width: int = 50, height: int
     normalized = [(v - min_val) / range_val for v in values]
     
     # Create graph
-    lines = []
-    
-    for row in range(height, -1, -1):
-        threshold = row / height
-        line = "│"
-        for val in normalized:
-            if val >= threshold:
-                line += "█"
-            else:
-                line += " "
-        lines.append(line)
+    if np is not None:
+        norm = np.asarray(normalized, dtype=np.float64)
+        if njit is not None:
+            cells = np.empty((height + 1, len(normalized)), dtype="<u4")
+            _fill_graph(norm, height, cells)
+        else:
+            # One broadcast compare of every value against every row threshold
+            thresholds = np.arange(height, -1, -1, dtype=np.float64) / height
+            mask = norm[None, :] >= thresholds[:, None]
+            cells = np.where(mask, 0x2588, 0x20).astype("<u4")
+        # Each row holds UTF-32 codepoints, so it decodes to a string in one call
+        lines = ["│" + row.tobytes().decode("utf-32-le") for row in cells]
+    else:
+        lines = []
+        
+        for row in range(height, -1, -1):
+            threshold = row / height
+            line = "│"
+            for val in normalized:
+                if val >= threshold:
+                    line += "█"
+                else:
+                    line += " "
+            lines.append(line)
     
     # Add x-axis
     lines.append("└" + "─" * len(values))
@@ -11,7 +11,6 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from chatbot import SmartChatbot
-from analytics import ConversationAnalytics, ReportGenerator
 from utils import (
     print_banner, print_help, print_colored, 
     format_sentiment_badge, format_emotion_badge,
@@ -54,8 +53,8 @@ class ChatbotApplication:
         else:
             self.chatbot = SmartChatbot()
         
-        self.analytics = ConversationAnalytics(self.chatbot.ai_client)
-        self.report_generator = ReportGenerator(self.analytics)
+        self.analytics = self.chatbot.analytics
+        self.report_generator = self.chatbot.report_generator
         
         return True
     
@@ -3,49 +3,114 @@ Chatbot Module - AI-Driven Conversational Agent.
 Maintains conversation history and generates contextual responses using Gemini Flash 2.5.
 """
 
-from typing import Dict, Any, List, Optional
+import os
+import sys
+import time
+from collections import Counter, deque
+from typing import Dict, Any, Iterator, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
-from ai_client import GeminiAIClient
+from ai_client import GeminiAIClient, AIClientError
+from analytics import ConversationAnalytics, ReportGenerator
+from config import CONTEXT_WINDOW_SIZE, MAX_HISTORY_LENGTH
 from sentiment import SentimentAnalyzer, SentimentResult
+from utils import dumps_json
 
 
-class ConversationRole(Enum):
+# UI hint lookups for SmartChatbot, keyed by emotion
+COLOR_MAP = {
+    "happy": "#4CAF50",
+    "excited": "#FF9800",
+    "sad": "#2196F3",
+    "angry": "#F44336",
+    "confused": "#9C27B0",
+    "anxious": "#607D8B",
+    "neutral": "#9E9E9E",
+    "frustrated": "#E91E63",
+    "hopeful": "#00BCD4",
+    "surprised": "#FFEB3B"
+}
+
+ICON_MAP = {
+    "happy": "😊",
+    "excited": "🎉",
+    "sad": "😢",
+    "angry": "😠",
+    "confused": "😕",
+    "anxious": "😰",
+    "neutral": "😐",
+    "frustrated": "😤",
+    "hopeful": "🌟",
+    "surprised": "😮"
+}
+
+INTENSITY_MAP = {"low": 1, "medium": 2, "high": 3}
+
+# Messages kept in Chatbot.history besides the system message (a turn is a user
+# and an assistant message); older ones move to the archive
+LIVE_MESSAGE_LIMIT = 2 * MAX_HISTORY_LENGTH
+
+# Ordering used by SmartChatbot to tell improving from declining mood
+MOOD_VALUES = {"positive": 1, "neutral": 0, "negative": -1}
+
+
+class ConversationRole(str, Enum):
     """Enum for conversation participant roles."""
     USER = "user"
     ASSISTANT = "assistant"
     SYSTEM = "system"
 
 
-@dataclass
+# Roles are stored on messages as interned strings, so `==` between them usually
+# succeeds on identity. Compare with `==`, never `is`: unpickled chatbots hold copies.
+USER_ROLE = sys.intern(ConversationRole.USER.value)
+ASSISTANT_ROLE = sys.intern(ConversationRole.ASSISTANT.value)
+SYSTEM_ROLE = sys.intern(ConversationRole.SYSTEM.value)
+
+
+def _role_str(role) -> str:
+    """Normalize a ConversationRole or role name to its interned string."""
+    if isinstance(role, ConversationRole):
+        role = role.value
+    return sys.intern(role)
+
+
+@dataclass(slots=True)
 class Message:
     """Data class for a conversation message."""
-    role: ConversationRole
+    role: str  # USER_ROLE, ASSISTANT_ROLE or SYSTEM_ROLE; a ConversationRole is accepted
     content: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)  # datetime built on demand
     sentiment: Optional[SentimentResult] = None
     
+    def __post_init__(self):
+        self.role = _role_str(self.role)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
-            "role": self.role.value,
+            "role": self.role,
             "content": self.content,
             "timestamp": self.timestamp.isoformat(),
             "sentiment": self.sentiment.to_dict() if self.sentiment else None
         }
 
 
+@dataclass(slots=True)
 class ConversationState:
     """Tracks the state of the conversation."""
-    
-    def __init__(self):
-        self.mood: str = "neutral"
-        self.engagement_level: str = "normal"
-        self.topics_discussed: List[str] = []
-        self.sentiment_trend: str = "stable"
-        self.last_emotion: str = "neutral"
+    mood: str = "neutral"
+    engagement_level: str = "normal"
+    topics_discussed: List[str] = field(default_factory=list)
+    sentiment_trend: str = "stable"
+    last_emotion: str = "neutral"
     
     def update(self, sentiment_result: SentimentResult):
         """Update state based on new sentiment analysis."""
@@ -91,9 +156,21 @@ class Chatbot:
         """
         self.ai_client = ai_client or GeminiAIClient()
         self.sentiment_analyzer = SentimentAnalyzer(self.ai_client)
-        self.history: List[Message] = []
         self.state = ConversationState()
         
+        # Created on first use; see the analytics and report_generator properties
+        self._analytics: Optional[ConversationAnalytics] = None
+        self._report_generator: Optional[ReportGenerator] = None
+        
+        # Optional SemanticResponseCache shared between chatbots
+        self.response_cache = None
+
+        # Bumped on every history change; keys the AI result cache
+        self._version = 0
+        # Tells this conversation apart from a later one restarting at the same version
+        self._instance_id = os.urandom(8).hex()
+        self._reset_history()
+        
         # Set default system prompt if not provided
         self.system_prompt = system_prompt or (
             "You are a friendly, intelligent AI assistant. "
@@ -104,24 +181,110 @@ class Chatbot:
         # Add system message
         self._add_system_message(self.system_prompt)
     
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the AI client, analytics and response cache, which hold live resources."""
+        state = self.__dict__.copy()
+        state["ai_client"] = None
+        state["_analytics"] = None
+        state["_report_generator"] = None
+        state["response_cache"] = None
+        state["_view_cache"] = {}
+        return state
+    
+    def bind_client(self, ai_client: GeminiAIClient):
+        """
+        Attach an AI client, e.g. after the chatbot was unpickled.
+        
+        Args:
+            ai_client: Client used for all further AI calls
+        """
+        self.ai_client = ai_client
+        self.sentiment_analyzer.ai_client = ai_client
+        self._analytics = None
+        self._report_generator = None
+    
+    @property
+    def state_key(self) -> str:
+        """Identifies the current history; any result computed from it stays valid while this is unchanged."""
+        return f"{self._instance_id}:{self._version}"
+    
+    @property
+    def analytics(self) -> ConversationAnalytics:
+        """Analytics over this conversation, reused across calls."""
+        if self._analytics is None:
+            self._analytics = ConversationAnalytics(self.ai_client, self.sentiment_analyzer)
+        return self._analytics
+    
+    @property
+    def report_generator(self) -> ReportGenerator:
+        """Report generator sharing this conversation's analytics."""
+        if self._report_generator is None:
+            self._report_generator = ReportGenerator(self.analytics)
+        return self._report_generator
+    
+    def _reset_history(self):
+        """Clear the history together with the views maintained alongside it."""
+        # System message plus the last LIVE_MESSAGE_LIMIT messages
+        self.history: List[Message] = []
+        # Older messages, oldest first, between the system message and history[1].
+        # Kept as Message objects: they share their text with the views below.
+        self._archive: List[Message] = []
+        self._ai_cache: Dict[str, tuple] = {}
+        # History views in dict form, cheap to rebuild so never pickled
+        self._view_cache: Dict[str, tuple] = {}
+        self._role_counts: Counter = Counter()
+        self._user_message_texts: List[str] = []
+        # Non-system messages in the {"role", "content"} shape the AI client takes
+        self._ai_history: List[Dict[str, str]] = []
+        # The same dicts for the last few messages (system included) sent with each reply
+        self._recent_ai_dicts: deque = deque(maxlen=CONTEXT_WINDOW_SIZE)
+    
     def _add_system_message(self, content: str):
         """Add a system message to history."""
         message = Message(
-            role=ConversationRole.SYSTEM,
+            role=SYSTEM_ROLE,
             content=content
         )
         self.history.append(message)
+        self._role_counts[SYSTEM_ROLE] += 1
+        self._recent_ai_dicts.append({"role": SYSTEM_ROLE, "content": content})
+        self._version += 1
     
-    def _add_message(self, role: ConversationRole, content: str, 
+    def _add_message(self, role, content: str, 
                      sentiment: SentimentResult = None) -> Message:
-        """Add a message to history."""
+        """Add a message to history. role may be a ConversationRole or its string."""
+        role = _role_str(role)
         message = Message(
             role=role,
             content=content,
             sentiment=sentiment
         )
         self.history.append(message)
+        if len(self.history) > LIVE_MESSAGE_LIMIT + 1:
+            self._archive.append(self.history.pop(1))
+        self._role_counts[role] += 1
+        if role == USER_ROLE:
+            self._user_message_texts.append(content)
+        ai_dict = {"role": role, "content": content}
+        if role != SYSTEM_ROLE:
+            self._ai_history.append(ai_dict)
+        self._recent_ai_dicts.append(ai_dict)
+        self._version += 1
         return message
+
+    def _memoize(self, kind: str, compute, cache: Dict[str, tuple] = None) -> Any:
+        """Return compute(), reusing the last result until the history changes."""
+        if cache is None:
+            cache = self._ai_cache
+        # Read the version first: a turn may land while compute() waits on the API
+        version = self._version
+        cached = cache.get(kind)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        value = compute()
+        cache[kind] = (version, value)
+        return value
     
     def chat(self, user_message: str) -> Dict[str, Any]:
         """
@@ -133,25 +296,122 @@ class Chatbot:
         Returns:
             Dictionary containing response and analysis
         """
-        # Step 1: Analyze user message sentiment
-        sentiment_result = self.sentiment_analyzer.analyze(user_message)
-        
-        # Step 2: Update conversation state
-        self.state.update(sentiment_result)
+        # A near-identical earlier turn answers without any AI call
+        cache_key, combined = self._lookup_cached_turn(user_message)
         
-        # Step 3: Add user message to history
-        self._add_message(
-            ConversationRole.USER, 
-            user_message, 
-            sentiment_result
-        )
+        # Steps 1-4 in one round trip when the combined call succeeds
+        if combined is None:
+            combined = self._analyze_and_reply(user_message)
+        if combined is not None:
+            sentiment_result, response = combined
+            self.state.update(sentiment_result)
+            self._add_message(USER_ROLE, user_message, sentiment_result)
+        else:
+            # Step 1: Analyze user message sentiment
+            sentiment_result = self.sentiment_analyzer.analyze(user_message)
+            
+            # Step 2: Update conversation state
+            self.state.update(sentiment_result)
+            
+            # Step 3: Add user message to history
+            self._add_message(
+                USER_ROLE, 
+                user_message, 
+                sentiment_result
+            )
+            
+            # Step 4: Generate contextual response
+            response = self._generate_response(user_message, sentiment_result)
         
-        # Step 4: Generate contextual response
-        response = self._generate_response(user_message, sentiment_result)
+        self._store_cached_turn(cache_key, sentiment_result, response)
         
         # Step 5: Add assistant response to history
-        self._add_message(ConversationRole.ASSISTANT, response)
+        self._add_message(ASSISTANT_ROLE, response)
+        
+        return self._turn_result(response, sentiment_result)
+    
+    def chat_stream(self, user_message: str) -> Iterator[Dict[str, Any]]:
+        """
+        Process a user message, yielding the response while it is generated.
+        
+        The reply can't be streamed out of the combined JSON call, so sentiment
+        is analyzed first and the reply is then streamed from a plain request.
         
+        Args:
+            user_message: The user's input
+            
+        Yields:
+            {"delta": text} for each part of the response, then {"result": ...}
+            holding the same dictionary chat() returns
+        """
+        cache_key, combined = self._lookup_cached_turn(user_message)
+        if combined is not None:
+            sentiment_result, response = combined
+        else:
+            sentiment_result = self.sentiment_analyzer.analyze(user_message)
+        
+        self.state.update(sentiment_result)
+        self._add_message(USER_ROLE, user_message, sentiment_result)
+        
+        parts = []
+        completed = False
+        try:
+            if combined is not None:
+                parts.append(response)
+                yield {"delta": response}
+            else:
+                for text in self.ai_client.generate_reply_stream(
+                    user_message=user_message,
+                    conversation_history=list(self._recent_ai_dicts),
+                    current_mood=self.state.mood,
+                    sentiment_context=self._sentiment_context(sentiment_result)
+                ):
+                    parts.append(text)
+                    yield {"delta": text}
+            completed = True
+        finally:
+            # Runs on client disconnect (GeneratorExit) too, so the user turn
+            # always gets the reply, or as much of it as was sent
+            response = "".join(parts).strip()
+            if response:
+                if completed and combined is None:
+                    self._store_cached_turn(cache_key, sentiment_result, response)
+                self._add_message(ASSISTANT_ROLE, response)
+
+        yield {"result": self._turn_result(response, sentiment_result)}
+    
+    def _lookup_cached_turn(self, user_message: str) -> tuple:
+        """
+        Look the message up in the response cache.
+        
+        Returns:
+            (cache_key, combined): combined is a (SentimentResult, reply) tuple on a hit;
+            cache_key is set on a miss so the new turn can be stored under it
+        """
+        if self.response_cache is None:
+            return None, None
+        
+        cache_key = self.response_cache.make_key(self._reply_context(), user_message)
+        cached = self.response_cache.lookup(cache_key)
+        if cached is None:
+            return cache_key, None
+        return None, (self.sentiment_analyzer.record(user_message, cached), cached["reply"])
+    
+    def _store_cached_turn(self, cache_key, sentiment_result: SentimentResult, response: str):
+        """Add a freshly generated turn to the response cache after a miss."""
+        if cache_key is None:
+            return
+        self.response_cache.store(cache_key, {
+            "sentiment": sentiment_result.sentiment,
+            "confidence": sentiment_result.confidence,
+            "emotion": sentiment_result.emotion,
+            "emotion_intensity": sentiment_result.emotion_intensity,
+            "reasoning": sentiment_result.reasoning,
+            "reply": response
+        })
+    
+    def _turn_result(self, response: str, sentiment_result: SentimentResult) -> Dict[str, Any]:
+        """Build the dictionary returned for a completed turn."""
         return {
             "response": response,
             "sentiment": sentiment_result.to_dict(),
@@ -159,93 +419,142 @@ class Chatbot:
             "mood_context": self._get_mood_context()
         }
     
+    def _reply_context(self) -> Dict[str, Any]:
+        """Everything besides the message that the next reply is generated from."""
+        return {
+            "system_prompt": self.system_prompt,
+            "mood": self.state.mood,
+            "history": list(self._recent_ai_dicts)
+        }
+    
+    def _analyze_and_reply(self, user_message: str) -> Optional[tuple]:
+        """
+        Analyze sentiment and generate the reply with a single AI call.
+        
+        Returns:
+            (SentimentResult, reply) tuple, or None when the combined response
+            is unusable and the separate analysis and reply calls should be made
+        """
+        try:
+            result = self.ai_client.chat_with_sentiment(
+                user_message=user_message,
+                conversation_history=list(self._recent_ai_dicts),
+                current_mood=self.state.mood
+            )
+        except AIClientError:
+            return None
+        
+        if not isinstance(result, dict) or not isinstance(result.get("reply"), str):
+            return None
+        reply = result["reply"].strip()
+        if not reply:
+            return None
+        
+        return self.sentiment_analyzer.record(user_message, result), reply
+    
     def _generate_response(self, user_message: str, sentiment: SentimentResult) -> str:
         """Generate an AI response based on context and sentiment."""
-        # Prepare conversation history for context
-        history_for_ai = [
-            {"role": msg.role.value, "content": msg.content}
-            for msg in self.history[-10:]  # Last 10 messages
-        ]
-        
-        # Create sentiment context
-        sentiment_context = (
-            f"User sentiment: {sentiment.sentiment} | "
-            f"Emotion: {sentiment.emotion} ({sentiment.emotion_intensity}) | "
-            f"Reason: {sentiment.reasoning}"
-        )
+        # Prepare conversation history for context (last CONTEXT_WINDOW_SIZE messages)
+        history_for_ai = list(self._recent_ai_dicts)
         
         # Generate response using AI
         response = self.ai_client.generate_reply(
             user_message=user_message,
             conversation_history=history_for_ai,
             current_mood=self.state.mood,
-            sentiment_context=sentiment_context
+            sentiment_context=self._sentiment_context(sentiment)
         )
         
         return response.strip()
     
+    def _sentiment_context(self, sentiment: SentimentResult) -> str:
+        """Describe the analyzed sentiment for the reply prompt."""
+        return (
+            f"User sentiment: {sentiment.sentiment} | "
+            f"Emotion: {sentiment.emotion} ({sentiment.emotion_intensity}) | "
+            f"Reason: {sentiment.reasoning}"
+        )
+    
     def _get_mood_context(self) -> str:
         """Get current mood context as a string."""
-        stats = self.sentiment_analyzer.get_summary_stats()
+        state = self.state
         
         return (
-            f"Current mood: {self.state.mood} | "
-            f"Emotion: {self.state.last_emotion} | "
-            f"Engagement: {self.state.engagement_level} | "
-            f"Messages: {stats['total_messages']}"
+            f"Current mood: {state.mood} | "
+            f"Emotion: {state.last_emotion} | "
+            f"Engagement: {state.engagement_level} | "
+            f"Messages: {len(self.sentiment_analyzer.history)}"
         )
     
     def get_history(self) -> List[Dict[str, Any]]:
-        """Get conversation history as list of dicts."""
-        return [msg.to_dict() for msg in self.history]
+        """
+        Get the full conversation history, archived messages included, as list of dicts.
+        The same list is returned until the history changes; don't modify it.
+        """
+        return self._memoize("history", self._build_history, self._view_cache)
+    
+    def _build_history(self) -> List[Dict[str, Any]]:
+        """Serialize the system message, archived and live messages in order."""
+        messages = self.history[:1] + self._archive + self.history[1:]
+        return [msg.to_dict() for msg in messages]
     
     def get_user_messages(self) -> List[str]:
         """Get all user messages."""
-        return [
-            msg.content for msg in self.history 
-            if msg.role == ConversationRole.USER
-        ]
+        return list(self._user_message_texts)
     
     def get_sentiment_history(self) -> List[Dict[str, Any]]:
-        """Get sentiment analysis history."""
-        return self.sentiment_analyzer.get_history_dicts()
+        """
+        Get sentiment analysis history.
+        The same list is returned until the history changes; don't modify it.
+        """
+        return self._memoize(
+            "sentiment_history", self.sentiment_analyzer.get_history_dicts, self._view_cache
+        )
     
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Get AI-generated conversation summary."""
-        history_for_summary = [
-            {"role": msg.role.value, "content": msg.content}
-            for msg in self.history
-            if msg.role != ConversationRole.SYSTEM
-        ]
-        
-        return self.ai_client.summarize_conversation(history_for_summary)
+        return self._memoize(
+            "summary", lambda: self.ai_client.summarize_conversation(self._ai_history)
+        )
     
     def get_keywords(self) -> Dict[str, Any]:
         """Get AI-extracted keywords from conversation."""
-        history_for_keywords = [
-            {"role": msg.role.value, "content": msg.content}
-            for msg in self.history
-            if msg.role != ConversationRole.SYSTEM
-        ]
+        return self._memoize(
+            "keywords", lambda: self.ai_client.extract_keywords(self._ai_history)
+        )
+    
+    def get_json(self, kind: str) -> bytes:
+        """
+        Get statistics, summary, keywords or the history already encoded as JSON.
+        The bytes are reused until the history changes, so polling is cheap.
         
-        return self.ai_client.extract_keywords(history_for_keywords)
+        Args:
+            kind: "stats", "summary", "keywords" or "history" ({"history": [...]})
+            
+        Returns:
+            JSON-encoded result
+        """
+        getters = {
+            "stats": self.get_statistics,
+            "summary": self.get_conversation_summary,
+            "keywords": self.get_keywords,
+            "history": lambda: {"history": self.get_history()}
+        }
+        return self._memoize(kind + "_json", lambda: dumps_json(getters[kind]()))
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get conversation statistics."""
-        user_msgs = sum(1 for m in self.history if m.role == ConversationRole.USER)
-        assistant_msgs = sum(1 for m in self.history if m.role == ConversationRole.ASSISTANT)
-        
         return {
-            "total_messages": len(self.history) - 1,  # Exclude system message
-            "user_messages": user_msgs,
-            "assistant_messages": assistant_msgs,
+            "total_messages": self._role_counts[USER_ROLE] + self._role_counts[ASSISTANT_ROLE],
+            "user_messages": self._role_counts[USER_ROLE],
+            "assistant_messages": self._role_counts[ASSISTANT_ROLE],
             "sentiment_stats": self.sentiment_analyzer.get_summary_stats(),
             "conversation_state": self.state.to_dict()
         }
     
     def reset(self):
         """Reset the conversation."""
-        self.history = []
+        self._reset_history()
         self.state = ConversationState()
         self.sentiment_analyzer.clear_history()
         self._add_system_message(self.system_prompt)
@@ -259,11 +568,18 @@ class Chatbot:
         """
         self.system_prompt = personality
         # Update system message in history
-        if self.history and self.history[0].role == ConversationRole.SYSTEM:
+        if self.history and self.history[0].role == SYSTEM_ROLE:
             self.history[0] = Message(
-                role=ConversationRole.SYSTEM,
+                role=SYSTEM_ROLE,
                 content=personality
             )
+            self._version += 1
+            # The system prompt may still be inside the reply window
+            self._recent_ai_dicts = deque(
+                ({"role": msg.role, "content": msg.content}
+                 for msg in self.history[-CONTEXT_WINDOW_SIZE:]),
+                maxlen=CONTEXT_WINDOW_SIZE
+            )
 
 
 class SmartChatbot(Chatbot):
@@ -275,12 +591,22 @@ class SmartChatbot(Chatbot):
     def __init__(self, ai_client: GeminiAIClient = None):
         super().__init__(ai_client)
         self.mood_shift_threshold = 2  # Number of messages to detect mood shift
-        self.previous_moods: List[str] = []
+        # Only the last mood_shift_threshold moods are ever compared
+        self.previous_moods = deque(maxlen=self.mood_shift_threshold)
     
     def chat(self, user_message: str) -> Dict[str, Any]:
         """Enhanced chat with mood shift detection."""
-        result = super().chat(user_message)
-        
+        return self._add_mood_insights(super().chat(user_message))
+    
+    def chat_stream(self, user_message: str) -> Iterator[Dict[str, Any]]:
+        """Streaming chat with mood shift detection on the final result."""
+        for event in super().chat_stream(user_message):
+            if "result" in event:
+                self._add_mood_insights(event["result"])
+            yield event
+    
+    def _add_mood_insights(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Add mood shift detection and UI hints to a turn result."""
         # Track mood for shift detection
         self.previous_moods.append(result["sentiment"]["sentiment"])
         
@@ -298,18 +624,16 @@ class SmartChatbot(Chatbot):
         if len(self.previous_moods) < self.mood_shift_threshold:
             return None
         
-        recent = self.previous_moods[-self.mood_shift_threshold:]
+        recent = self.previous_moods
         
         # Check if there's a consistent shift
         if len(set(recent)) == 1:
             return None  # No shift, mood is consistent
         
         # Detect direction of shift
-        mood_values = {"positive": 1, "neutral": 0, "negative": -1}
-        
         if len(recent) >= 2:
-            prev_val = mood_values.get(recent[-2], 0)
-            curr_val = mood_values.get(recent[-1], 0)
+            prev_val = MOOD_VALUES.get(recent[-2], 0)
+            curr_val = MOOD_VALUES.get(recent[-1], 0)
             
             if curr_val > prev_val:
                 return {"direction": "improving", "from": recent[-2], "to": recent[-1]}
@@ -323,36 +647,8 @@ class SmartChatbot(Chatbot):
         emotion = sentiment.get("emotion", "neutral")
         intensity = sentiment.get("emotion_intensity", "medium")
         
-        # Color suggestions
-        color_map = {
-            "happy": "#4CAF50",
-            "excited": "#FF9800",
-            "sad": "#2196F3",
-            "angry": "#F44336",
-            "confused": "#9C27B0",
-            "anxious": "#607D8B",
-            "neutral": "#9E9E9E",
-            "frustrated": "#E91E63",
-            "hopeful": "#00BCD4",
-            "surprised": "#FFEB3B"
-        }
-        
-        # Icon suggestions
-        icon_map = {
-            "happy": "😊",
-            "excited": "🎉",
-            "sad": "😢",
-            "angry": "😠",
-            "confused": "😕",
-            "anxious": "😰",
-            "neutral": "😐",
-            "frustrated": "😤",
-            "hopeful": "🌟",
-            "surprised": "😮"
-        }
-        
         return {
-            "suggested_color": color_map.get(emotion, "#9E9E9E"),
-            "emotion_icon": icon_map.get(emotion, "😐"),
-            "intensity_level": {"low": 1, "medium": 2, "high": 3}.get(intensity, 2)
+            "suggested_color": COLOR_MAP.get(emotion, "#9E9E9E"),
+            "emotion_icon": ICON_MAP.get(emotion, "😐"),
+            "intensity_level": INTENSITY_MAP.get(intensity, 2)
         }
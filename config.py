@@ -11,6 +11,7 @@ MODEL_NAME = "gemini-2.5-flash"
 
 # Application Settings
 MAX_HISTORY_LENGTH = 50  # Maximum conversation turns to keep
+CONTEXT_WINDOW_SIZE = 10  # Recent messages sent with each reply for context
 TEMPERATURE = 0.7  # AI creativity level (0.0 - 1.0)
 MAX_OUTPUT_TOKENS = 2048  # Maximum response length
 
@@ -23,3 +24,25 @@ EMOTION_CATEGORIES = [
 
 # Analytics Settings
 TREND_WINDOW_SIZE = 5  # Number of messages to consider for trend analysis
+ANALYTICS_CACHE_SIZE = 128  # Cached AI analysis results per analytics instance
+
+# Web Session Settings
+FLASK_SECRET_KEY = os.environ.get("FLASK_SECRET_KEY")  # Unset generates a new key (and drops sessions) per start
+REDIS_URL = os.environ.get("REDIS_URL")  # Unset keeps sessions in process memory (single worker)
+SESSION_TTL_SECONDS = 3600  # Idle sessions expire after this long
+SESSION_LOCK_TIMEOUT_SECONDS = 120  # Longest a chat turn may hold its session lock
+SESSION_MAX_IN_MEMORY = 10000  # Chatbots kept by the in-process store before evicting the oldest
+JOB_QUEUE_ENABLED = False  # Build reports, summaries and keywords in an rq worker (needs REDIS_URL, rq and a running `rq worker`)
+JOB_TIMEOUT_SECONDS = 300  # Longest a background job may wait in the queue, and again to run
+JOB_RESULT_TTL_SECONDS = 600  # Finished job results stay available for polling this long
+
+# Semantic Response Cache (web app; needs numpy and sentence-transformers)
+RESPONSE_CACHE_ENABLED = False  # Serve near-duplicate messages from previous replies
+RESPONSE_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # Sentence encoder
+RESPONSE_CACHE_THRESHOLD = 0.9  # Minimum cosine similarity for a cache hit
+RESPONSE_CACHE_SIZE = 10000  # Cached turns kept per process
+RESPONSE_CACHE_TTL_SECONDS = 24 * 3600  # Cached turns expire after this long
+
+# Batch Mode Settings (offline report generation, up to 24h turnaround)
+BATCH_POLL_INTERVAL_SECONDS = 30  # Delay between batch job status checks
+BATCH_TIMEOUT_SECONDS = 24 * 3600  # Give up on a batch job after this long
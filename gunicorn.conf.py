@@ -0,0 +1,41 @@
+"""
+Gunicorn settings for the web app.
+Picked up automatically when gunicorn is started from the project directory.
+"""
+
+import multiprocessing
+import os
+from importlib.util import find_spec
+
+from config import FLASK_SECRET_KEY, REDIS_URL
+
+# /chat spends almost all its time waiting on Gemini, so each worker serves many
+# requests at once: gevent greenlets when installed, otherwise a thread pool
+try:
+    import gevent  # noqa: F401
+    worker_class = os.getenv("WEB_WORKER_CLASS", "gevent")
+except ImportError:
+    worker_class = os.getenv("WEB_WORKER_CLASS", "gthread")
+
+# A session survives across processes only when its chatbot is kept in Redis and
+# every worker accepts its cookie: with one fixed FLASK_SECRET_KEY, or with
+# Flask-Session keeping the session itself in Redis. Without a fixed key each
+# worker signs cookies with its own random one.
+shared_sessions = bool(REDIS_URL) and (bool(FLASK_SECRET_KEY) or find_spec("flask_session") is not None)
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() if shared_sessions else 1))
+worker_connections = 1000  # gevent: concurrent requests per worker
+threads = 32               # gthread: concurrent requests per worker
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+keepalive = 30
+timeout = 120  # Slow Gemini replies and streamed answers
+
+
+def when_ready(server):
+    """Warn loudly when several workers can't share sessions."""
+    if workers > 1 and not shared_sessions:
+        server.log.warning(
+            "%d workers but sessions are not shared between them: set REDIS_URL and "
+            "FLASK_SECRET_KEY (or install Flask-Session), or conversations will seem to "
+            "reset whenever a request reaches another worker.", workers
+        )
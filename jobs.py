@@ -0,0 +1,155 @@
+"""
+Jobs Module - Background generation of the slow, AI-backed web results.
+With JOB_QUEUE_ENABLED, /report, /summary and /keywords run in an RQ worker
+(`rq worker --url $REDIS_URL`) instead of blocking a web worker.
+"""
+
+import hashlib
+from typing import Optional
+
+from ai_client import GeminiAIClient
+from chatbot import SmartChatbot
+from config import JOB_QUEUE_ENABLED, JOB_RESULT_TTL_SECONDS, JOB_TIMEOUT_SECONDS
+from session_store import RedisSessionStore, create_session_store
+
+# Optional task queue; results are generated inline without it
+try:
+    from rq import Queue
+    from rq.job import Job
+    from rq.exceptions import NoSuchJobError
+except ImportError:
+    Queue = None
+
+JOB_KINDS = ("report", "summary", "keywords")
+
+# RQ job statuses that will never produce a result. Deferred jobs wait on
+# dependencies, which these jobs never have.
+_ENDED_STATUSES = ("failed", "stopped", "canceled", "deferred")
+
+# Session store and AI client of the worker process, created on the first job
+# and shared by every job after it
+_session_store = None
+_ai_client = None
+
+
+def generate_result(session_id: str, kind: str) -> bytes:
+    """
+    Generate one AI-backed result for a session. Runs in the worker process.
+    The result is also saved in the session store, so the route can answer
+    later requests for the same conversation state without a job.
+    
+    Args:
+        session_id: Session whose conversation is analyzed
+        kind: One of JOB_KINDS
+        
+    Returns:
+        JSON-encoded result, as the matching route would return it
+    """
+    global _session_store, _ai_client
+    if _session_store is None:
+        _session_store = create_session_store()
+    if _ai_client is None:
+        _ai_client = GeminiAIClient()
+    
+    chatbot = _session_store.get(session_id)
+    if chatbot is None:
+        # Expired since it was queued: answer as the route would for a new session
+        chatbot = SmartChatbot(ai_client=_ai_client)
+    else:
+        chatbot.bind_client(_ai_client)
+    
+    if kind == "report":
+        body = chatbot.report_generator.generate_json_bytes(
+            chatbot.get_history(), chatbot.get_sentiment_history()
+        )
+    else:
+        body = chatbot.get_json(kind)
+    _session_store.save_result(session_id, chatbot.state_key, kind, body)
+    return body
+
+
+def create_job_queue(session_store, enabled: bool = JOB_QUEUE_ENABLED) -> Optional["Queue"]:
+    """
+    Create the queue for background results if it is enabled in config.
+    Nothing here can tell whether an `rq worker` is running, so the queue is
+    only used when explicitly enabled.
+    
+    Args:
+        session_store: The web app's session store; its Redis connection is reused
+        enabled: Whether to queue results instead of building them inline
+        
+    Returns:
+        RQ Queue, or None when JOB_QUEUE_ENABLED is off
+    """
+    if not enabled:
+        return None
+    
+    if Queue is None:
+        raise RuntimeError("JOB_QUEUE_ENABLED needs the 'rq' package.")
+    if not isinstance(session_store, RedisSessionStore):
+        raise RuntimeError("JOB_QUEUE_ENABLED needs REDIS_URL, so the worker can load sessions.")
+    return Queue(connection=session_store.client)
+
+
+def enqueue_result(queue: "Queue", session_id: str, state_key: str, kind: str) -> str:
+    """
+    Queue generate_result for a session, unless a job for the same
+    conversation state is already queued, running or finished.
+    
+    Args:
+        queue: Queue from create_job_queue()
+        session_id: Session whose conversation is analyzed
+        state_key: The chatbot's state_key; a new turn needs a new job
+        kind: One of JOB_KINDS
+        
+    Returns:
+        Job id to poll with fetch_result()
+    """
+    # Repeated clicks map to the same job; the id doesn't reveal the session id
+    job_id = hashlib.blake2b(
+        f"{session_id}:{state_key}:{kind}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    
+    try:
+        job = Job.fetch(job_id, connection=queue.connection)
+    except NoSuchJobError:
+        job = None
+    if job is not None and job.get_status() not in _ENDED_STATUSES:
+        return job.id
+    
+    job = queue.enqueue(
+        generate_result, session_id, kind,
+        job_id=job_id,
+        ttl=JOB_TIMEOUT_SECONDS,  # Discarded if no worker picks it up in time
+        job_timeout=JOB_TIMEOUT_SECONDS,
+        result_ttl=JOB_RESULT_TTL_SECONDS,
+        failure_ttl=JOB_RESULT_TTL_SECONDS,
+        meta={"session_id": session_id}
+    )
+    return job.id
+
+
+def fetch_result(queue: "Queue", job_id: str, session_id: str) -> tuple:
+    """
+    Look up a queued job on behalf of a session.
+    
+    Returns:
+        (status, result): status is "finished", "failed" (also stopped or
+        canceled), "pending" or "missing" (unknown, expired, or queued by
+        another session); result is the
+        encoded body once finished, otherwise None
+    """
+    try:
+        job = Job.fetch(job_id, connection=queue.connection)
+    except NoSuchJobError:
+        return "missing", None
+    
+    if job.meta.get("session_id") != session_id:
+        return "missing", None
+    
+    status = job.get_status()
+    if status == "finished":
+        return "finished", job.result
+    if status in _ENDED_STATUSES:
+        return "failed", None
+    return "pending", None
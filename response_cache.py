@@ -0,0 +1,130 @@
+"""
+Response Cache Module - Semantic cache of previous chatbot turns.
+Serves a stored reply and sentiment analysis when a new message is close
+enough to one already answered in the same context, skipping the Gemini call entirely.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from config import (
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MODEL, RESPONSE_CACHE_THRESHOLD,
+    RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS
+)
+
+# Optional dependencies; the cache is disabled unless both are installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+class SemanticResponseCache:
+    """
+    Fixed-size cache of (context, embedding -> turn) entries searched by cosine similarity.
+    Only entries generated from exactly the same context can match, so a reply built
+    from one conversation is never served into another. The oldest entry is overwritten
+    once the cache is full; expired entries never match.
+    """
+
+    def __init__(self, encode: Callable[[str], Sequence[float]],
+                 threshold: float = RESPONSE_CACHE_THRESHOLD,
+                 max_entries: int = RESPONSE_CACHE_SIZE,
+                 ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            encode: Function turning text into an embedding vector
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Number of turns kept
+            ttl: Seconds an entry stays valid
+        """
+        self._encode = encode
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._vectors = None  # Allocated on first store, once the dimension is known
+        self._scopes = np.zeros(max_entries, dtype=np.int64)  # Context digests
+        self._expires = np.zeros(max_entries)
+        self._values: list = [None] * max_entries
+        self._count = 0
+        self._next = 0
+
+    def make_key(self, context: Any, message: str) -> tuple:
+        """
+        Build the cache key for a message.
+
+        Args:
+            context: JSON-serializable inputs the reply depends on besides the
+                message (system prompt, mood, recent messages); matched exactly
+            message: The user's new message; matched by similarity
+
+        Returns:
+            (context digest, unit-length message embedding)
+        """
+        payload = json.dumps(context, sort_keys=True, default=str).encode("utf-8")
+        scope = int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "little", signed=True)
+
+        vector = np.asarray(self._encode(message), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return scope, (vector / norm if norm else vector)
+
+    def lookup(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return the cached turn most similar to key, or None below the threshold."""
+        scope, vector = key
+        with self._lock:
+            if not self._count:
+                return None
+
+            similarities = self._vectors[:self._count] @ vector
+            similarities[self._expires[:self._count] < time.monotonic()] = -1.0
+            similarities[self._scopes[:self._count] != scope] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return self._values[best]
+
+    def store(self, key: tuple, value: Dict[str, Any]):
+        """Cache a turn under key, replacing the oldest entry when full."""
+        scope, vector = key
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+            slot = self._next
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._values[slot] = value
+            self._next = (slot + 1) % self.max_entries
+            self._count = min(self._count + 1, self.max_entries)
+
+
+def create_response_cache() -> Optional[SemanticResponseCache]:
+    """
+    Create the shared response cache if it is enabled in config.
+
+    Returns:
+        SemanticResponseCache, or None when RESPONSE_CACHE_ENABLED is off
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+
+    if np is None or SentenceTransformer is None:
+        raise RuntimeError(
+            "RESPONSE_CACHE_ENABLED needs the 'numpy' and 'sentence-transformers' packages."
+        )
+
+    model = SentenceTransformer(RESPONSE_CACHE_MODEL)
+    return SemanticResponseCache(lambda text: model.encode(text, normalize_embeddings=True))
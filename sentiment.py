@@ -3,6 +3,8 @@ Sentiment Analysis Module - AI-Powered Sentiment & Emotion Classification.
 All analysis is performed using Google Gemini Flash 2.5 API.
 """
 
+import time
+from collections import Counter
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -10,7 +12,7 @@ from datetime import datetime
 from ai_client import GeminiAIClient
 
 
-@dataclass
+@dataclass(slots=True)
 class SentimentResult:
     """Data class for sentiment analysis results."""
     message: str
@@ -19,7 +21,12 @@ class SentimentResult:
     emotion: str
     emotion_intensity: str
     reasoning: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)  # datetime built on demand
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -52,6 +59,22 @@ class SentimentAnalyzer:
         """Initialize the sentiment analyzer."""
         self.ai_client = ai_client or GeminiAIClient()
         self.history: List[SentimentResult] = []
+        self._reset_counters()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the AI client, which holds live connections."""
+        state = self.__dict__.copy()
+        state["ai_client"] = None
+        state["_history_dicts"] = None
+        return state
+
+    def _reset_counters(self):
+        """Reset the running statistics kept alongside the history."""
+        self._sentiment_counter: Counter = Counter()
+        self._emotion_counter: Counter = Counter()
+        self._confidence_sum = 0.0
+        # Last list built by get_history_dicts(), see is_current_history()
+        self._history_dicts: Optional[List[Dict[str, Any]]] = None
     
     def analyze(self, message: str) -> SentimentResult:
         """
@@ -65,8 +88,19 @@ class SentimentAnalyzer:
         """
         # Get AI analysis
         analysis = self.ai_client.analyze_sentiment(message)
+        return self.record(message, analysis)
+    
+    def record(self, message: str, analysis: Dict[str, Any]) -> SentimentResult:
+        """
+        Store an analysis that was produced elsewhere, e.g. alongside a reply.
         
-        # Create result object
+        Args:
+            message: The analyzed text
+            analysis: Dictionary in the shape returned by analyze_sentiment
+            
+        Returns:
+            SentimentResult with full analysis
+        """
         result = SentimentResult(
             message=message,
             sentiment=analysis.get("sentiment", "neutral"),
@@ -76,8 +110,13 @@ class SentimentAnalyzer:
             reasoning=analysis.get("reasoning", "Analysis completed.")
         )
         
-        # Store in history
+        # Store in history and update the running statistics; lists handed out
+        # before this no longer match them
         self.history.append(result)
+        self._history_dicts = None
+        self._sentiment_counter[result.sentiment] += 1
+        self._emotion_counter[result.emotion] += 1
+        self._confidence_sum += result.confidence
         
         return result
     
@@ -99,7 +138,15 @@ class SentimentAnalyzer:
     
     def get_history_dicts(self) -> List[Dict[str, Any]]:
         """Get history as list of dictionaries."""
-        return [result.to_dict() for result in self.history]
+        self._history_dicts = [result.to_dict() for result in self.history]
+        return self._history_dicts
+
+    def is_current_history(self, history_dicts: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether a list is this analyzer's latest get_history_dicts() result
+        with nothing recorded since, so the running counters describe it exactly.
+        """
+        return history_dicts is not None and history_dicts is self._history_dicts
     
     def get_dominant_sentiment(self) -> Optional[str]:
         """
@@ -111,11 +158,7 @@ class SentimentAnalyzer:
         if not self.history:
             return None
         
-        sentiment_counts = {}
-        for result in self.history:
-            sentiment_counts[result.sentiment] = sentiment_counts.get(result.sentiment, 0) + 1
-        
-        return max(sentiment_counts, key=sentiment_counts.get)
+        return self._sentiment_counter.most_common(1)[0][0]
     
     def get_dominant_emotion(self) -> Optional[str]:
         """
@@ -127,37 +170,25 @@ class SentimentAnalyzer:
         if not self.history:
             return None
         
-        emotion_counts = {}
-        for result in self.history:
-            emotion_counts[result.emotion] = emotion_counts.get(result.emotion, 0) + 1
-        
-        return max(emotion_counts, key=emotion_counts.get)
+        return self._emotion_counter.most_common(1)[0][0]
     
     def get_average_confidence(self) -> float:
         """Get average confidence score from history."""
         if not self.history:
             return 0.0
         
-        return sum(r.confidence for r in self.history) / len(self.history)
+        return self._confidence_sum / len(self.history)
     
     def get_sentiment_distribution(self) -> Dict[str, int]:
         """Get count of each sentiment type."""
-        distribution = {"positive": 0, "negative": 0, "neutral": 0}
-        
-        for result in self.history:
-            if result.sentiment in distribution:
-                distribution[result.sentiment] += 1
-        
-        return distribution
+        return {
+            sentiment: self._sentiment_counter[sentiment]
+            for sentiment in ("positive", "negative", "neutral")
+        }
     
     def get_emotion_distribution(self) -> Dict[str, int]:
         """Get count of each emotion type."""
-        distribution = {}
-        
-        for result in self.history:
-            distribution[result.emotion] = distribution.get(result.emotion, 0) + 1
-        
-        return distribution
+        return dict(self._emotion_counter)
     
     def get_recent_mood(self, n: int = 3) -> str:
         """
@@ -183,6 +214,7 @@ class SentimentAnalyzer:
     def clear_history(self):
         """Clear all sentiment history."""
         self.history = []
+        self._reset_counters()
     
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get comprehensive summary statistics."""
@@ -196,6 +228,29 @@ class SentimentAnalyzer:
             "recent_mood": self.get_recent_mood()
         }
 
+    def get_running_stats(self) -> Dict[str, Any]:
+        """
+        Get report statistics from the running counters in O(1).
+        Matches the shape of ConversationAnalytics._calculate_statistics.
+        """
+        total = len(self.history)
+        if not total:
+            return {
+                "total_messages": 0,
+                "sentiment_distribution": {},
+                "emotion_distribution": {},
+                "average_confidence": 0.0
+            }
+
+        return {
+            "total_messages": total,
+            "sentiment_distribution": dict(self._sentiment_counter),
+            "emotion_distribution": dict(self._emotion_counter),
+            "average_confidence": self._confidence_sum / total,
+            "dominant_sentiment": self._sentiment_counter.most_common(1)[0][0],
+            "dominant_emotion": self._emotion_counter.most_common(1)[0][0]
+        }
+
 
 class SentimentPipeline:
     """
@@ -0,0 +1,226 @@
+"""
+Session Store Module - Where the web app keeps one chatbot per browser session.
+Uses process memory by default, or Redis when REDIS_URL is configured.
+"""
+
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config import (
+    REDIS_URL, SESSION_TTL_SECONDS, SESSION_LOCK_TIMEOUT_SECONDS, SESSION_MAX_IN_MEMORY
+)
+
+logger = logging.getLogger(__name__)
+
+# Optional shared backend for multi-worker deployments
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class SessionLock:
+    """
+    Process-local session lock whose acquire() gives up after a timeout,
+    like the Redis lock's blocking_timeout, so a hung turn can't block the
+    session's later requests forever.
+    """
+
+    __slots__ = ("_lock", "timeout")
+
+    def __init__(self, timeout: float = SESSION_LOCK_TIMEOUT_SECONDS):
+        self._lock = threading.Lock()
+        self.timeout = timeout
+
+    def acquire(self) -> bool:
+        """Wait up to timeout seconds for the lock; return whether it was acquired."""
+        return self._lock.acquire(timeout=self.timeout)
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+
+class InMemorySessionStore:
+    """
+    Keeps chatbot objects in a dict inside this process.
+    Only suitable for a single worker. Memory stays bounded: sessions idle for
+    longer than ttl expire, and the least recently used one is evicted at capacity.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX_IN_MEMORY, ttl: float = SESSION_TTL_SECONDS,
+                 lock_timeout: float = SESSION_LOCK_TIMEOUT_SECONDS):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Most chatbots kept at once
+            ttl: Seconds a session survives without being used
+            lock_timeout: Seconds a request waits for a session lock before giving up
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        # session_id -> (expiry, chatbot), least recently used first
+        self._chatbots: "OrderedDict[str, tuple]" = OrderedDict()
+        self._locks: Dict[str, SessionLock] = {}
+        self._guard = threading.Lock()
+
+    def get(self, session_id: str):
+        """Return the session's chatbot, or None if there is none."""
+        with self._guard:
+            entry = self._chatbots.get(session_id)
+            if entry is None:
+                return None
+
+            now = time.monotonic()
+            if entry[0] < now:
+                self._drop(session_id, "expired")
+                return None
+
+            self._chatbots[session_id] = (now + self.ttl, entry[1])
+            self._chatbots.move_to_end(session_id)
+            return entry[1]
+
+    def save(self, session_id: str, chatbot):
+        """Store the session's chatbot, evicting idle or surplus sessions."""
+        with self._guard:
+            now = time.monotonic()
+            self._chatbots[session_id] = (now + self.ttl, chatbot)
+            self._chatbots.move_to_end(session_id)
+
+            # Least recently used entries sit at the front, so expired ones do too
+            while self._chatbots:
+                oldest_id, (expires, _) = next(iter(self._chatbots.items()))
+                if expires >= now and len(self._chatbots) <= self.max_sessions:
+                    break
+                self._drop(oldest_id, "expired" if expires < now else "evicted")
+
+    def delete(self, session_id: str):
+        """Forget the session's chatbot."""
+        with self._guard:
+            self._chatbots.pop(session_id, None)
+            self._locks.pop(session_id, None)
+
+    def get_result(self, session_id: str, state_key: str, kind: str) -> Optional[bytes]:
+        """Always None: chatbots stay in memory, so their own result cache is reused."""
+        return None
+
+    def save_result(self, session_id: str, state_key: str, kind: str, body: bytes):
+        """Nothing to do, see get_result()."""
+
+    def lock(self, session_id: str) -> SessionLock:
+        """Return the lock serializing changes to one session's chatbot."""
+        with self._guard:
+            lock = self._locks.get(session_id)
+            if lock is None:
+                lock = self._locks[session_id] = SessionLock(self.lock_timeout)
+            return lock
+
+    def __len__(self) -> int:
+        return len(self._chatbots)
+
+    def _drop(self, session_id: str, reason: str):
+        """Remove a session; callers hold the guard."""
+        del self._chatbots[session_id]
+        lock = self._locks.get(session_id)
+        if lock is not None and not lock.locked():
+            del self._locks[session_id]
+        logger.info("Session %s %s (%d in memory)", session_id, reason, len(self._chatbots))
+
+
+class RedisSessionStore:
+    """
+    Keeps pickled chatbot objects in Redis with an idle expiry.
+    Any worker can serve any session, and abandoned sessions expire on their own.
+    Chatbots are stored without their AI client; rebind one after get().
+    """
+
+    def __init__(self, client, ttl: int = SESSION_TTL_SECONDS, prefix: str = "cb:"):
+        """
+        Initialize the store.
+
+        Args:
+            client: redis.Redis connection (decode_responses must be off)
+            ttl: Seconds a session survives without being used
+            prefix: Key prefix for chatbot entries
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, session_id: str):
+        """Return the session's chatbot and restart its expiry, or None if there is none."""
+        # Reads count as use, so sessions that only poll results don't expire
+        data = self.client.getex(self.prefix + session_id, ex=self.ttl)
+        if data is None:
+            return None
+        return pickle.loads(data)
+
+    def save(self, session_id: str, chatbot):
+        """Store the session's chatbot and restart its expiry."""
+        self.client.setex(
+            self.prefix + session_id,
+            self.ttl,
+            pickle.dumps(chatbot, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+    def delete(self, session_id: str):
+        """Forget the session's chatbot."""
+        self.client.delete(self.prefix + session_id)
+
+    def get_result(self, session_id: str, state_key: str, kind: str) -> Optional[bytes]:
+        """
+        Return a JSON result saved for the chatbot state, or None.
+        Chatbots are unpickled afresh for each request, so results computed on
+        them are kept here instead, shared by every worker.
+
+        Args:
+            session_id: Session the result belongs to
+            state_key: Chatbot.state_key the result was computed from
+            kind: Result name, e.g. "summary"
+        """
+        return self.client.get(self._result_key(session_id, state_key, kind))
+
+    def save_result(self, session_id: str, state_key: str, kind: str, body: bytes):
+        """Keep a JSON result for get_result(), expiring like the session."""
+        self.client.setex(self._result_key(session_id, state_key, kind), self.ttl, body)
+
+    def _result_key(self, session_id: str, state_key: str, kind: str) -> str:
+        return f"{self.prefix}{session_id}:{kind}:{state_key}"
+
+    def lock(self, session_id: str):
+        """
+        Return a Redis lock serializing changes to one session across all workers.
+        Hold it from get() through save() so concurrent turns don't overwrite each other.
+        """
+        return self.client.lock(
+            f"lock:{self.prefix}{session_id}",
+            timeout=SESSION_LOCK_TIMEOUT_SECONDS,
+            blocking_timeout=SESSION_LOCK_TIMEOUT_SECONDS
+        )
+
+
+def create_session_store(redis_url: Optional[str] = REDIS_URL):
+    """
+    Create the session store for the configured backend.
+
+    Args:
+        redis_url: Redis connection URL; None keeps sessions in process memory
+
+    Returns:
+        RedisSessionStore or InMemorySessionStore
+    """
+    if not redis_url:
+        return InMemorySessionStore()
+
+    if redis is None:
+        raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed.")
+
+    return RedisSessionStore(redis.Redis.from_url(redis_url, decode_responses=False))
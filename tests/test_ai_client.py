@@ -71,6 +71,23 @@ class TestGeminiAIClient:
         
         assert result == expected_response
     
+    def test_generate_reply_stream(self, mock_client):
+        """Test that reply text is yielded chunk by chunk."""
+        mock_client.client.models.generate_content_stream.return_value = iter(
+            [MockResponse("I'd be "), MockResponse(None), MockResponse("happy to help!")]
+        )
+        
+        chunks = list(mock_client.generate_reply_stream(user_message="Can you help me?"))
+        
+        assert chunks == ["I'd be ", "happy to help!"]
+    
+    def test_generate_reply_stream_error(self, mock_client):
+        """Test that streaming failures raise AIClientError."""
+        mock_client.client.models.generate_content_stream.side_effect = Exception("API Error")
+        
+        with pytest.raises(AIClientError):
+            list(mock_client.generate_reply_stream(user_message="Hello"))
+    
     def test_analyze_sentiment_valid_json(self, mock_client):
         """Test sentiment analysis with valid JSON response."""
         json_response = json.dumps({
@@ -100,6 +117,31 @@ class TestGeminiAIClient:
         assert result["confidence"] == 0.5
         assert result["emotion"] == "neutral"
     
+    def test_chat_with_sentiment(self, mock_client):
+        """Test combined analysis and reply with structured output."""
+        mock_client.client.models.generate_content.return_value = MockResponse(json.dumps({
+            "sentiment": "positive",
+            "confidence": 0.9,
+            "emotion": "excited",
+            "emotion_intensity": "high",
+            "reasoning": "User shared good news",
+            "reply": "That's wonderful news!"
+        }))
+        
+        result = mock_client.chat_with_sentiment("I got the job!")
+        
+        assert result["reply"] == "That's wonderful news!"
+        assert result["emotion"] == "excited"
+        config = mock_client.client.models.generate_content.call_args[1]["config"]
+        assert config.response_mime_type == "application/json"
+        assert config.response_schema is not None
+    
+    def test_chat_with_sentiment_unparseable(self, mock_client):
+        """Test that an unusable combined response returns None."""
+        mock_client.client.models.generate_content.return_value = MockResponse("Sure! Happy to help.")
+        
+        assert mock_client.chat_with_sentiment("Hello") is None
+    
     def test_summarize_conversation(self, mock_client):
         """Test conversation summarization."""
         json_response = json.dumps({
@@ -211,6 +253,82 @@ class TestGeminiAIClient:
         assert result == '{"key": "value"}'
 
 
+class TestBatchFullReport:
+    """Test suite for Batch Mode report generation."""
+
+    HISTORY = [{"role": "user", "content": "Hello"}]
+    SENTIMENTS = [{"sentiment": "positive", "emotion": "happy"}]
+
+    @pytest.fixture
+    def client(self):
+        """Create a client with mocked API."""
+        with patch('ai_client.genai.Client'):
+            return GeminiAIClient(api_key="test_key")
+
+    @staticmethod
+    def _result_line(key, text):
+        return json.dumps({
+            "key": key,
+            "response": {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        })
+
+    def test_results_demultiplexed_by_key(self, client):
+        """Test that batch output lines are mapped back to their report sections."""
+        job = Mock()
+        job.state.name = "JOB_STATE_SUCCEEDED"
+        client.client.batches.create.return_value = job
+        client.client.files.download.return_value = "\n".join([
+            self._result_line("emotion_profile", "Mostly happy."),
+            self._result_line("trends", '{"trend": "improving"}'),
+            self._result_line("keywords", '{"keywords": ["hello"]}'),
+            self._result_line("summary", '{"summary": "A greeting."}'),
+            self._result_line("mood_graph", "Positive | ●"),
+        ]).encode("utf-8")
+
+        result = client.batch_full_report(self.HISTORY, self.SENTIMENTS)
+
+        assert result["trends"]["trend"] == "improving"
+        assert result["keywords"]["keywords"] == ["hello"]
+        assert result["summary"]["summary"] == "A greeting."
+        assert result["mood_graph"] == "Positive | ●"
+        assert result["emotion_profile"] == "Mostly happy."
+        client.client.models.generate_content.assert_not_called()
+
+    def test_failed_job_falls_back_to_sequential(self, client):
+        """Test that a failed batch job falls back to direct calls."""
+        job = Mock()
+        job.state.name = "JOB_STATE_FAILED"
+        client.client.batches.create.return_value = job
+        client.client.models.generate_content.return_value = MockResponse('{"trend": "stable"}')
+
+        result = client.batch_full_report(self.HISTORY, self.SENTIMENTS)
+
+        assert result["trends"]["trend"] == "stable"
+        assert client.client.models.generate_content.call_count == 5
+
+    def test_malformed_output_falls_back_to_sequential(self, client):
+        """Test that unparseable result lines are treated as a failed job."""
+        job = Mock()
+        job.state.name = "JOB_STATE_SUCCEEDED"
+        client.client.batches.create.return_value = job
+        client.client.files.download.return_value = b'{"key": "trends", "respo'
+        client.client.models.generate_content.return_value = MockResponse('{"trend": "stable"}')
+
+        result = client.batch_full_report(self.HISTORY, self.SENTIMENTS)
+
+        assert result["trends"]["trend"] == "stable"
+        assert client.client.models.generate_content.call_count == 5
+
+    def test_failed_job_raises_without_fallback(self, client):
+        """Test that batch failures surface when fallback is disabled."""
+        job = Mock()
+        job.state.name = "JOB_STATE_FAILED"
+        client.client.batches.create.return_value = job
+
+        with pytest.raises(AIClientError):
+            client.batch_full_report(self.HISTORY, self.SENTIMENTS, synchronous_fallback=False)
+
+
 class TestPromptConstruction:
     """Test suite for prompt construction logic."""
     
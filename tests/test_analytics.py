@@ -0,0 +1,224 @@
+"""
+Unit tests for Analytics Module.
+Tests report generation and statistics with mocked API responses.
+"""
+
+import pytest
+from unittest.mock import Mock, patch, AsyncMock
+import json
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_client import GeminiAIClient
+from analytics import ConversationAnalytics, ReportGenerator, create_simple_ascii_graph
+
+
+class MockResponse:
+    """Mock response object for Gemini API."""
+    def __init__(self, text):
+        self.text = text
+
+
+CONVERSATION = [
+    {"role": "user", "content": "I finally passed my exam!"},
+    {"role": "assistant", "content": "Congratulations!"}
+]
+
+SENTIMENTS = [
+    {"sentiment": "negative", "emotion": "anxious", "confidence": 0.6},
+    {"sentiment": "positive", "emotion": "happy", "confidence": 0.9},
+    {"sentiment": "positive", "emotion": "excited", "confidence": 0.9}
+]
+
+
+class TestFullReport:
+    """Test suite for full report generation."""
+
+    @pytest.fixture
+    def analytics(self):
+        """Create analytics backed by a client with a mocked async API."""
+        with patch('ai_client.genai.Client'):
+            client = GeminiAIClient(api_key="test_key")
+        client.client.aio.models.generate_content = AsyncMock(
+            return_value=MockResponse(json.dumps({"trend": "improving", "summary": "Exam news"}))
+        )
+        return ConversationAnalytics(client)
+
+    def test_full_report_sections(self, analytics):
+        """Test that the report contains every section."""
+        report = analytics.get_full_report(CONVERSATION, SENTIMENTS)
+
+        assert report["trends"]["trend"] == "improving"
+        assert report["summary"]["summary"] == "Exam news"
+        assert "keywords" in report
+        assert "mood_graph" in report
+        assert "emotion_profile" in report
+        assert report["statistics"]["total_messages"] == 3
+
+    def test_full_report_issues_calls_concurrently(self, analytics):
+        """Test that all five analyses go through the async client."""
+        analytics.get_full_report(CONVERSATION, SENTIMENTS)
+
+        assert analytics.ai_client.client.aio.models.generate_content.await_count == 5
+        analytics.ai_client.client.models.generate_content.assert_not_called()
+
+
+class TestResultCache:
+    """Test suite for caching AI results by history content."""
+
+    @pytest.fixture
+    def analytics(self):
+        """Create analytics with a mocked AI client."""
+        client = Mock()
+        client.summarize_conversation.return_value = {"summary": "Exam news"}
+        return ConversationAnalytics(client)
+
+    def test_repeat_call_uses_cache(self, analytics):
+        """Test that an unchanged history is only sent to the API once."""
+        first = analytics.get_summary(CONVERSATION)
+        second = analytics.get_summary(list(CONVERSATION))
+
+        assert first == second
+        analytics.ai_client.summarize_conversation.assert_called_once()
+
+    def test_changed_history_misses_cache(self, analytics):
+        """Test that a new message triggers a fresh API call."""
+        analytics.get_summary(CONVERSATION)
+        analytics.get_summary(CONVERSATION + [{"role": "user", "content": "Thanks!"}])
+
+        assert analytics.ai_client.summarize_conversation.call_count == 2
+
+    def test_fallback_mood_graph_not_cached(self):
+        """Test that an API failure is retried on the next call instead of pinned."""
+        with patch('ai_client.genai.Client'):
+            client = GeminiAIClient(api_key="test_key")
+        client.client.models.generate_content.side_effect = [
+            Exception("API Error"), MockResponse("Positive | ●")
+        ]
+        analytics = ConversationAnalytics(client)
+
+        assert analytics.generate_mood_graph(SENTIMENTS) == client.fallback_mood_graph(SENTIMENTS)
+        assert analytics.generate_mood_graph(SENTIMENTS) == "Positive | ●"
+        assert analytics.generate_mood_graph(SENTIMENTS) == "Positive | ●"
+        assert client.client.models.generate_content.call_count == 2
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entry is evicted."""
+        client = Mock()
+        analytics = ConversationAnalytics(client, cache_size=2)
+
+        for i in range(3):
+            analytics.get_summary([{"role": "user", "content": str(i)}])
+        analytics.get_summary([{"role": "user", "content": "0"}])
+
+        assert len(analytics._cache) == 2
+        assert client.summarize_conversation.call_count == 4
+
+
+class TestStatistics:
+    """Test suite for report statistics."""
+
+    @pytest.fixture
+    def analytics(self):
+        """Create analytics with a mocked AI client."""
+        return ConversationAnalytics(Mock())
+
+    def test_statistics(self, analytics):
+        """Test distributions, averages and dominant values."""
+        stats = analytics._calculate_statistics(SENTIMENTS)
+
+        assert stats["total_messages"] == 3
+        assert stats["sentiment_distribution"] == {"negative": 1, "positive": 2}
+        assert stats["emotion_distribution"]["happy"] == 1
+        assert stats["average_confidence"] == pytest.approx(0.8)
+        assert stats["dominant_sentiment"] == "positive"
+        assert stats["dominant_emotion"] == "anxious"
+
+    def test_statistics_empty(self, analytics):
+        """Test statistics with no sentiment history."""
+        stats = analytics._calculate_statistics([])
+
+        assert stats["total_messages"] == 0
+        assert stats["average_confidence"] == 0.0
+
+
+class TestReportGenerator:
+    """Test suite for formatted reports."""
+
+    @pytest.fixture
+    def generator(self):
+        """Create a report generator over canned analytics."""
+        analytics = Mock()
+        analytics.get_full_report.return_value = {
+            "summary": {"summary": "Exam news", "key_points": ["Passed exam"]},
+            "trends": {"trend": "improving", "mood_shifts": ["anxious → happy"]},
+            "keywords": {"keywords": ["exam", "pass"]},
+            "statistics": {"total_messages": 3, "average_confidence": 0.8,
+                           "sentiment_distribution": {"positive": 2}},
+            "mood_graph": "GRAPH",
+            "emotion_profile": "PROFILE"
+        }
+        return ReportGenerator(analytics)
+
+    def test_text_report_layout(self, generator):
+        """Test header, sections and footer of the text report."""
+        lines = generator.generate_text_report(CONVERSATION, SENTIMENTS).split("\n")
+
+        assert lines[:4] == ["=" * 60, "           CONVERSATION ANALYTICS REPORT", "=" * 60, ""]
+        assert lines[-3:] == ["=" * 60, "           END OF REPORT", "=" * 60]
+        assert "  • Passed exam" in lines
+        assert "  ↔ anxious → happy" in lines
+        assert "Keywords: exam, pass" in lines
+        assert "Average Confidence: 80.0%" in lines
+        assert "  Positive: 2" in lines
+        assert lines[lines.index("📊 MOOD VISUALIZATION") + 2] == "GRAPH"
+
+    def test_prepared_report_shared_between_formats(self, generator):
+        """Test that one prepared report renders as both text and JSON."""
+        report = generator.prepare_report(CONVERSATION, SENTIMENTS)
+
+        text = generator.generate_text_report(CONVERSATION, SENTIMENTS, report=report)
+        data = generator.generate_json_report(CONVERSATION, SENTIMENTS, report=report)
+
+        assert "Exam news" in text
+        assert data is report
+        generator.analytics.get_full_report.assert_called_once()
+
+    def test_json_bytes(self, generator):
+        """Test the pre-encoded JSON report round-trips."""
+        encoded = generator.generate_json_bytes(CONVERSATION, SENTIMENTS)
+
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == generator.prepare_report(CONVERSATION, SENTIMENTS)
+
+    def test_json_bytes_without_orjson(self, generator):
+        """Test the stdlib fallback produces the same document."""
+        with patch('utils.orjson', None):
+            encoded = generator.generate_json_bytes(CONVERSATION, SENTIMENTS)
+
+        assert json.loads(encoded)["mood_graph"] == "GRAPH"
+
+
+class TestSimpleAsciiGraph:
+    """Test suite for the fallback ASCII graph."""
+
+    def test_graph_layout(self):
+        """Test bars are drawn against evenly spaced thresholds."""
+        graph = create_simple_ascii_graph([0.0, 0.5, 1.0], height=2)
+
+        assert graph == "\n".join([
+            "│  █",
+            "│ ██",
+            "│███",
+            "└───"
+        ])
+
+    def test_graph_empty(self):
+        """Test graph with no values."""
+        assert create_simple_ascii_graph([]) == "No data to display."
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,6 +3,7 @@ Unit tests for Chatbot Module.
 Tests conversation management, history tracking, and AI-driven responses.
 """
 
+import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
@@ -44,6 +45,32 @@ class TestMessage:
         assert d["content"] == "Hello! How can I help?"
         assert "timestamp" in d
 
+    def test_role_normalized_to_interned_string(self):
+        """Test that enum and string roles are stored as the same string object."""
+        from chatbot import USER_ROLE
+
+        from_enum = Message(role=ConversationRole.USER, content="Hi")
+        from_str = Message(role="".join(["us", "er"]), content="Hi")
+
+        assert from_enum.role is USER_ROLE
+        assert from_str.role is USER_ROLE
+        assert type(from_enum.to_dict()["role"]) is str
+
+    def test_timestamp_on_demand(self):
+        """Test that the stored nanosecond stamp converts to a datetime."""
+        msg = Message(role=ConversationRole.USER, content="Hi", timestamp_ns=1_700_000_000_500_000_000)
+
+        assert msg.timestamp == datetime.fromtimestamp(1_700_000_000.5)
+        assert msg.to_dict()["timestamp"] == msg.timestamp.isoformat()
+
+    def test_slotted(self):
+        """Test that messages carry no per-instance __dict__."""
+        msg = Message(role=ConversationRole.USER, content="Hi")
+
+        assert not hasattr(msg, "__dict__")
+        with pytest.raises(AttributeError):
+            msg.extra = "not allowed"
+
 
 class TestConversationState:
     """Test suite for ConversationState class."""
@@ -86,6 +113,13 @@ class TestConversationState:
         assert "engagement_level" in d
         assert "sentiment_trend" in d
 
+    def test_topics_not_shared(self):
+        """Test that each state gets its own topics list."""
+        first = ConversationState()
+        first.topics_discussed.append("exams")
+
+        assert ConversationState().topics_discussed == []
+
 
 class TestChatbot:
     """Test suite for Chatbot class."""
@@ -147,7 +181,54 @@ class TestChatbot:
         chatbot.chat("I'm feeling happy today!")
         
         mock_ai_client.analyze_sentiment.assert_called()
-    
+
+    def test_chat_mood_context(self, chatbot):
+        """Test the mood context line returned with each reply."""
+        chatbot.chat("Message 1")
+        result = chatbot.chat("Message 2")
+
+        assert result["mood_context"] == (
+            "Current mood: neutral | Emotion: neutral | Engagement: normal | Messages: 2"
+        )
+
+    def test_analytics_reused(self, chatbot):
+        """Test that analytics objects are created once per chatbot."""
+        assert chatbot.analytics is chatbot.analytics
+        assert chatbot.report_generator.analytics is chatbot.analytics
+        assert chatbot.analytics.sentiment_analyzer is chatbot.sentiment_analyzer
+
+    def test_chat_single_call(self, chatbot, mock_ai_client):
+        """Test that a combined response skips the separate API calls."""
+        mock_ai_client.chat_with_sentiment.return_value = {
+            "sentiment": "positive",
+            "confidence": 0.9,
+            "emotion": "excited",
+            "emotion_intensity": "high",
+            "reasoning": "User shared good news",
+            "reply": " Congratulations! "
+        }
+
+        result = chatbot.chat("I got the job!")
+
+        assert result["response"] == "Congratulations!"
+        assert result["sentiment"]["emotion"] == "excited"
+        assert chatbot.state.engagement_level == "high"
+        assert chatbot.get_history()[-2]["sentiment"]["sentiment"] == "positive"
+        assert len(chatbot.get_sentiment_history()) == 1
+        mock_ai_client.analyze_sentiment.assert_not_called()
+        mock_ai_client.generate_reply.assert_not_called()
+
+    def test_chat_falls_back_to_two_calls(self, chatbot, mock_ai_client):
+        """Test the separate calls are used when the combined call fails."""
+        from ai_client import AIClientError
+
+        mock_ai_client.chat_with_sentiment.side_effect = AIClientError("schema rejected")
+
+        chatbot.chat("Hello")
+
+        mock_ai_client.analyze_sentiment.assert_called_once()
+        mock_ai_client.generate_reply.assert_called_once()
+
     def test_get_history(self, chatbot):
         """Test getting conversation history."""
         chatbot.chat("Test message")
@@ -195,6 +276,56 @@ class TestChatbot:
         
         assert "keywords" in keywords
         mock_ai_client.extract_keywords.assert_called()
+
+    def test_summary_cached_until_history_changes(self, chatbot, mock_ai_client):
+        """Test that repeat summaries reuse the AI result until a new message."""
+        chatbot.chat("Test message")
+        
+        chatbot.get_conversation_summary()
+        chatbot.get_conversation_summary()
+        assert mock_ai_client.summarize_conversation.call_count == 1
+        
+        chatbot.chat("Another message")
+        chatbot.get_conversation_summary()
+        assert mock_ai_client.summarize_conversation.call_count == 2
+    
+    def test_summary_not_reused_after_concurrent_turn(self, chatbot, mock_ai_client):
+        """Test that a turn landing mid-summary makes the next call summarize again."""
+        chatbot.chat("Test message")
+        
+        def summarize_during_chat(history):
+            if mock_ai_client.summarize_conversation.call_count == 1:
+                chatbot.chat("Sent while summarizing")
+            return {"summary": f"{len(history)} messages"}
+        mock_ai_client.summarize_conversation.side_effect = summarize_during_chat
+        
+        chatbot.get_conversation_summary()
+        
+        assert chatbot.get_conversation_summary() == {"summary": "4 messages"}
+        assert mock_ai_client.summarize_conversation.call_count == 2
+    
+    def test_json_bytes_reused_until_history_changes(self, chatbot):
+        """Test that encoded stats are the same object until a new message."""
+        chatbot.chat("Test message")
+        
+        first = chatbot.get_json("stats")
+        assert chatbot.get_json("stats") is first
+        assert json.loads(first)["user_messages"] == 1
+        
+        chatbot.chat("Another message")
+        assert json.loads(chatbot.get_json("stats"))["user_messages"] == 2
+        assert json.loads(chatbot.get_json("history"))["history"] == chatbot.get_history()
+    
+    def test_history_views_reused_until_history_changes(self, chatbot):
+        """Test that history lists are shared between calls until a new message."""
+        chatbot.chat("Test message")
+        
+        assert chatbot.get_history() is chatbot.get_history()
+        assert chatbot.get_sentiment_history() is chatbot.get_sentiment_history()
+        
+        chatbot.chat("Another message")
+        assert len(chatbot.get_history()) == 5
+        assert len(chatbot.get_sentiment_history()) == 2
     
     def test_get_statistics(self, chatbot):
         """Test getting conversation statistics."""
@@ -217,7 +348,18 @@ class TestChatbot:
         # Should only have system message
         assert len(chatbot.history) == 1
         assert chatbot.history[0].role == ConversationRole.SYSTEM
-    
+
+    def test_reset_clears_message_counts(self, chatbot):
+        """Test that statistics and user messages start over after reset."""
+        chatbot.chat("Test message")
+
+        chatbot.reset()
+        stats = chatbot.get_statistics()
+
+        assert stats["user_messages"] == 0
+        assert stats["assistant_messages"] == 0
+        assert chatbot.get_user_messages() == []
+
     def test_set_personality(self, chatbot):
         """Test setting chatbot personality."""
         new_personality = "You are a pirate who speaks in pirate language."
@@ -250,6 +392,33 @@ class TestSmartChatbot:
         """Create a SmartChatbot with mocked AI client."""
         return SmartChatbot(ai_client=mock_ai_client)
     
+    def test_chat_stream(self, smart_chatbot, mock_ai_client):
+        """Test that the reply streams in pieces and the final result matches chat()."""
+        mock_ai_client.generate_reply_stream.return_value = iter(["That's ", "great!"])
+        
+        events = list(smart_chatbot.chat_stream("I'm so happy!"))
+        
+        assert events[:2] == [{"delta": "That's "}, {"delta": "great!"}]
+        result = events[-1]["result"]
+        assert result["response"] == "That's great!"
+        assert result["sentiment"]["sentiment"] == "positive"
+        assert "ui_hints" in result
+        assert smart_chatbot.get_history()[-1]["content"] == "That's great!"
+        assert smart_chatbot.get_statistics()["user_messages"] == 1
+        mock_ai_client.generate_reply.assert_not_called()
+
+    def test_chat_stream_disconnect_keeps_partial_reply(self, smart_chatbot, mock_ai_client):
+        """Test that closing the stream mid-reply still pairs the user turn with a reply."""
+        mock_ai_client.generate_reply_stream.return_value = iter(["That's ", "great!"])
+
+        stream = smart_chatbot.chat_stream("I'm so happy!")
+        assert next(stream) == {"delta": "That's "}
+        stream.close()
+
+        history = smart_chatbot.get_history()
+        assert [m["role"] for m in history[-2:]] == ["user", "assistant"]
+        assert history[-1]["content"] == "That's"
+
     def test_mood_shift_detection_improving(self, smart_chatbot, mock_ai_client):
         """Test detection of improving mood."""
         # First message - negative
@@ -299,7 +468,14 @@ class TestSmartChatbot:
         
         assert result["mood_shift_detected"] is not None
         assert result["mood_shift_detected"]["direction"] == "declining"
-    
+
+    def test_previous_moods_bounded(self, smart_chatbot):
+        """Test that only the moods needed for shift detection are kept."""
+        for i in range(5):
+            smart_chatbot.chat(f"Message {i}")
+
+        assert len(smart_chatbot.previous_moods) == smart_chatbot.mood_shift_threshold
+
     def test_ui_hints_generation(self, smart_chatbot, mock_ai_client):
         """Test UI hints are generated."""
         mock_ai_client.analyze_sentiment.return_value = {
@@ -397,6 +573,55 @@ class TestHistoryManagement:
         assert user_msg["sentiment"] is not None
         assert "sentiment" in user_msg["sentiment"]
 
+    def test_reply_context_window(self, chatbot, mock_ai_client):
+        """Test that replies see the last 10 messages, system prompt included."""
+        chatbot.chat("First message")
+        
+        history = mock_ai_client.generate_reply.call_args[1]["conversation_history"]
+        assert [h["role"] for h in history] == ["system", "user"]
+        
+        for i in range(6):
+            chatbot.chat(f"Message {i}")
+        
+        history = mock_ai_client.generate_reply.call_args[1]["conversation_history"]
+        expected = [
+            {"role": m["role"], "content": m["content"]}
+            for m in chatbot.get_history()[-11:-1]  # Before the latest reply
+        ]
+        assert history == expected
+    
+    def test_reply_context_uses_new_personality(self, chatbot, mock_ai_client):
+        """Test that a personality change reaches the reply window."""
+        chatbot.set_personality("You are a pirate.")
+        chatbot.chat("Ahoy")
+        
+        history = mock_ai_client.generate_reply.call_args[1]["conversation_history"]
+        assert history[0] == {"role": "system", "content": "You are a pirate."}
+
+    def test_old_messages_archived(self, mock_ai_client):
+        """Test that live history is bounded while every view still covers the full record."""
+        with patch("chatbot.LIVE_MESSAGE_LIMIT", 4):
+            chatbot = Chatbot(ai_client=mock_ai_client)
+            for i in range(4):
+                chatbot.chat(f"Message {i}")
+
+        assert len(chatbot.history) == 5
+        assert chatbot.history[0].role == ConversationRole.SYSTEM
+
+        history = chatbot.get_history()
+        assert len(history) == 9
+        assert history[0]["role"] == "system"
+        messages = [f"Message {i}" for i in range(4)]
+        assert [h["content"] for h in history if h["role"] == "user"] == messages
+        assert chatbot.get_user_messages() == messages
+
+        chatbot.get_conversation_summary()
+        sent = mock_ai_client.summarize_conversation.call_args[0][0]
+        assert [m["content"] for m in sent if m["role"] == "user"] == messages
+
+        stats = chatbot.get_statistics()
+        assert stats["total_messages"] == 8
+        assert stats["user_messages"] == stats["sentiment_stats"]["total_messages"] == 4
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,142 @@
+"""
+Unit tests for Jobs Module.
+Tests background result generation without a running queue.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jobs
+from ai_client import GeminiAIClient
+from chatbot import SmartChatbot
+from session_store import InMemorySessionStore, RedisSessionStore
+
+
+@pytest.fixture
+def store():
+    """Create a session store holding one conversation."""
+    client = Mock()
+    client.chat_with_sentiment.return_value = {
+        "sentiment": "positive",
+        "confidence": 0.9,
+        "emotion": "happy",
+        "emotion_intensity": "high",
+        "reasoning": "Greeting",
+        "reply": "Hello!"
+    }
+    chatbot = SmartChatbot(ai_client=client)
+    chatbot.chat("Hi")
+
+    store = InMemorySessionStore()
+    store.save("abc", chatbot)
+    return store
+
+
+class TestGenerateResult:
+    """Test suite for the job run by the worker."""
+
+    def test_summary_uses_worker_client(self, store):
+        """Test that the stored chatbot is rebound to the worker's shared client."""
+        worker_client = Mock()
+        worker_client.summarize_conversation.return_value = {"summary": "A greeting"}
+
+        with patch('jobs._session_store', store), patch('jobs._ai_client', worker_client):
+            body = jobs.generate_result("abc", "summary")
+
+        assert json.loads(body) == {"summary": "A greeting"}
+        worker_client.summarize_conversation.assert_called_once()
+
+    def test_expired_session(self, store):
+        """Test that a job for an expired session answers like an empty conversation."""
+        with patch('ai_client.genai.Client'):
+            worker_client = GeminiAIClient(api_key="test_key")
+
+        with patch('jobs._session_store', store), patch('jobs._ai_client', worker_client):
+            body = jobs.generate_result("gone", "summary")
+
+        assert json.loads(body)["summary"] == "No conversation to summarize."
+
+    def test_result_saved_for_state(self):
+        """Test that the worker stores its result under the conversation state."""
+        store = Mock()
+        chatbot = store.get.return_value
+        chatbot.get_json.return_value = b'{"keywords":[]}'
+
+        with patch('jobs._session_store', store), patch('jobs._ai_client', Mock()):
+            jobs.generate_result("abc", "keywords")
+
+        store.save_result.assert_called_once_with("abc", chatbot.state_key, "keywords", b'{"keywords":[]}')
+
+class TestJobQueue:
+    """Test suite for queue setup and polling."""
+
+    def test_no_queue_unless_enabled(self):
+        """Test that results stay inline unless the queue is enabled, even with Redis."""
+        with patch('jobs.Queue', Mock(), create=True):
+            assert jobs.create_job_queue(RedisSessionStore(Mock())) is None
+            assert jobs.create_job_queue(RedisSessionStore(Mock()), enabled=True) is not None
+
+    def test_enabled_without_redis_or_rq(self):
+        """Test that enabling the queue without what it needs fails at startup."""
+        with patch('jobs.Queue', Mock(), create=True):
+            with pytest.raises(RuntimeError):
+                jobs.create_job_queue(InMemorySessionStore(), enabled=True)
+        with patch('jobs.Queue', None):
+            with pytest.raises(RuntimeError):
+                jobs.create_job_queue(RedisSessionStore(Mock()), enabled=True)
+
+    def test_repeat_request_reuses_job(self):
+        """Test that the same conversation state maps to one job until it fails."""
+        queue = Mock()
+        queue.enqueue.side_effect = lambda *args, job_id, **kwargs: Mock(id=job_id)
+        jobs_by_id = {}
+
+        def fetch(job_id, connection):
+            if job_id not in jobs_by_id:
+                raise KeyError(job_id)
+            return jobs_by_id[job_id]
+
+        with patch('jobs.Job', Mock(fetch=fetch), create=True), \
+                patch('jobs.NoSuchJobError', KeyError, create=True):
+            first = jobs.enqueue_result(queue, "abc", "s1:2", "report")
+            jobs_by_id[first] = Mock(id=first, get_status=Mock(return_value="started"))
+
+            assert jobs.enqueue_result(queue, "abc", "s1:2", "report") == first
+            assert queue.enqueue.call_count == 1
+
+            assert jobs.enqueue_result(queue, "abc", "s1:4", "report") != first
+            assert "abc" not in first
+
+            jobs_by_id[first].get_status.return_value = "canceled"
+            assert jobs.enqueue_result(queue, "abc", "s1:2", "report") == first
+            assert queue.enqueue.call_count == 3
+
+    def test_other_session_cannot_fetch(self):
+        """Test that a job is only visible to the session that queued it."""
+        job = Mock(meta={"session_id": "abc"}, get_status=Mock(return_value="finished"), result=b"{}")
+        with patch('jobs.Job', Mock(fetch=Mock(return_value=job)), create=True):
+            assert jobs.fetch_result(Mock(), "job1", "abc") == ("finished", b"{}")
+            assert jobs.fetch_result(Mock(), "job1", "xyz") == ("missing", None)
+
+
+    @pytest.mark.parametrize("status, expected", [
+        ("queued", "pending"),
+        ("started", "pending"),
+        ("failed", "failed"),
+        ("stopped", "failed"),
+        ("canceled", "failed"),
+    ])
+    def test_ended_jobs_reported_failed(self, status, expected):
+        """Test that jobs which will never finish aren't reported as pending."""
+        job = Mock(meta={"session_id": "abc"}, get_status=Mock(return_value=status))
+        with patch('jobs.Job', Mock(fetch=Mock(return_value=job)), create=True):
+            assert jobs.fetch_result(Mock(), "job1", "abc") == (expected, None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+"""
+Unit tests for Response Cache Module.
+Tests semantic lookup with a toy encoder and its use from the chatbot.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from chatbot import Chatbot
+from response_cache import SemanticResponseCache, create_response_cache
+
+
+def letter_counts(text):
+    """Toy encoder: letter frequencies, so similar wording gives similar vectors."""
+    vector = [0.0] * 26
+    for ch in text.lower():
+        if "a" <= ch <= "z":
+            vector[ord(ch) - ord("a")] += 1
+    return vector
+
+
+TURN = {
+    "sentiment": "positive",
+    "confidence": 0.9,
+    "emotion": "happy",
+    "emotion_intensity": "medium",
+    "reasoning": "Friendly greeting",
+    "reply": "Hi! How can I help?"
+}
+
+
+class TestSemanticResponseCache:
+    """Test suite for the cache itself."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a small cache over the toy encoder."""
+        return SemanticResponseCache(letter_counts, threshold=0.95, max_entries=2, ttl=60)
+
+    def test_similar_message_hits(self, cache):
+        """Test that a near-duplicate message returns the stored turn."""
+        cache.store(cache.make_key([], "hello there"), TURN)
+
+        assert cache.lookup(cache.make_key([], "Hello there!")) == TURN
+
+    def test_different_message_misses(self, cache):
+        """Test that an unrelated message is not served from cache."""
+        cache.store(cache.make_key([], "hello there"), TURN)
+
+        assert cache.lookup(cache.make_key([], "quantum physics exam")) is None
+
+    def test_different_context_misses(self, cache):
+        """Test that a reply is only served for the context it was generated in."""
+        cache.store(cache.make_key(["You are a tutor."], "hello there"), TURN)
+
+        assert cache.lookup(cache.make_key(["You are a pirate."], "hello there")) is None
+        assert cache.lookup(cache.make_key(["You are a tutor."], "hello there")) == TURN
+
+    def test_oldest_entry_replaced(self, cache):
+        """Test that the cache keeps at most max_entries turns."""
+        for text in ["hello there", "what is the weather", "tell me a joke"]:
+            cache.store(cache.make_key([], text), dict(TURN, reply=text))
+
+        assert cache.lookup(cache.make_key([], "hello there")) is None
+        assert cache.lookup(cache.make_key([], "tell me a joke"))["reply"] == "tell me a joke"
+
+    def test_expired_entry_misses(self, cache):
+        """Test that entries past their TTL never match."""
+        cache.ttl = -1
+        cache.store(cache.make_key([], "hello there"), TURN)
+
+        assert cache.lookup(cache.make_key([], "hello there")) is None
+
+    def test_disabled_by_default(self):
+        """Test that no cache is created unless enabled in config."""
+        assert create_response_cache() is None
+
+
+class TestChatbotWithCache:
+    """Test suite for serving chatbot turns from the cache."""
+
+    def test_second_session_served_from_cache(self):
+        """Test that a repeated opening message skips the AI client."""
+        cache = SemanticResponseCache(letter_counts, threshold=0.95)
+        first_client = Mock()
+        first_client.chat_with_sentiment.return_value = TURN
+        first = Chatbot(ai_client=first_client)
+        first.response_cache = cache
+        first.chat("Hello there")
+
+        second_client = Mock()
+        second = Chatbot(ai_client=second_client)
+        second.response_cache = cache
+        result = second.chat("hello there!")
+
+        assert result["response"] == "Hi! How can I help?"
+        assert result["sentiment"]["emotion"] == "happy"
+        assert second.get_statistics()["user_messages"] == 1
+        second_client.chat_with_sentiment.assert_not_called()
+        second_client.analyze_sentiment.assert_not_called()
+
+
+    def test_other_personality_not_served(self):
+        """Test that a reply generated under another system prompt is not reused."""
+        cache = SemanticResponseCache(letter_counts, threshold=0.95)
+        first_client = Mock()
+        first_client.chat_with_sentiment.return_value = TURN
+        first = Chatbot(ai_client=first_client)
+        first.response_cache = cache
+        first.chat("Hello there")
+
+        second_client = Mock()
+        second_client.chat_with_sentiment.return_value = dict(TURN, reply="Arr!")
+        second = Chatbot(ai_client=second_client, system_prompt="You are a pirate.")
+        second.response_cache = cache
+
+        assert second.chat("hello there!")["response"] == "Arr!"
+        second_client.chat_with_sentiment.assert_called_once()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
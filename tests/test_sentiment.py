@@ -235,6 +235,73 @@ class TestSentimentAnalyzer:
         assert "dominant_emotion" in stats
         assert "sentiment_distribution" in stats
 
+    def test_running_stats_match_history(self, analyzer, mock_ai_client):
+        """Test that running counters agree with a full history rescan."""
+        from analytics import ConversationAnalytics
+
+        for sentiment, emotion, confidence in [
+            ("negative", "sad", 0.6), ("positive", "happy", 0.9), ("positive", "hopeful", 0.7)
+        ]:
+            mock_ai_client.analyze_sentiment.return_value = {
+                "sentiment": sentiment,
+                "confidence": confidence,
+                "emotion": emotion,
+                "emotion_intensity": "medium",
+                "reasoning": "test"
+            }
+            analyzer.analyze("Test")
+
+        running = analyzer.get_running_stats()
+        rescanned = ConversationAnalytics(mock_ai_client)._calculate_statistics(
+            analyzer.get_history_dicts()
+        )
+
+        assert running.pop("average_confidence") == pytest.approx(rescanned.pop("average_confidence"))
+        assert running == rescanned
+
+    def test_running_stats_reset_on_clear(self, analyzer):
+        """Test that clearing history resets the running counters."""
+        analyzer.analyze("Test")
+        analyzer.clear_history()
+
+        stats = analyzer.get_running_stats()
+
+        assert stats["total_messages"] == 0
+        assert stats["sentiment_distribution"] == {}
+
+
+    def test_running_stats_only_for_own_history(self, analyzer, mock_ai_client):
+        """Test that analytics uses the counters only for the analyzer's own list."""
+        from analytics import ConversationAnalytics
+
+        analyzer.analyze("Test")
+        analytics = ConversationAnalytics(mock_ai_client, analyzer)
+        other = [{"sentiment": "negative", "emotion": "angry", "confidence": 0.4}]
+
+        assert analytics._calculate_statistics(other)["dominant_emotion"] == "angry"
+        own = analyzer.get_history_dicts()
+        assert analyzer.is_current_history(own)
+        assert not analyzer.is_current_history(list(own))
+        analyzer.analyze("Another")
+        assert not analyzer.is_current_history(own)
+
+
+    def test_running_stats_not_used_for_old_list_of_same_length(self, analyzer, mock_ai_client):
+        """Test that a list built before the history changed isn't matched by its length."""
+        from analytics import ConversationAnalytics
+
+        analytics = ConversationAnalytics(mock_ai_client, analyzer)
+        for _ in range(5):
+            analyzer.record("Good", {"sentiment": "positive", "emotion": "happy"})
+        old = analyzer.get_history_dicts()
+        analyzer.clear_history()
+        for _ in range(5):
+            analyzer.record("Bad", {"sentiment": "negative", "emotion": "sad"})
+
+        assert len(old) == len(analyzer.history)
+        assert not analyzer.is_current_history(old)
+        assert analytics._calculate_statistics(old)["sentiment_distribution"] == {"positive": 5}
+
 
 class TestSentimentPipeline:
     """Test suite for SentimentPipeline class."""
@@ -0,0 +1,204 @@
+"""
+Unit tests for Session Store Module.
+Tests session storage backends with a fake Redis connection.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_client import GeminiAIClient
+from chatbot import SmartChatbot
+from session_store import InMemorySessionStore, RedisSessionStore, create_session_store
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis.Redis calls the store uses."""
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def getex(self, key, ex=None):
+        if key in self.data and ex is not None:
+            self.ttls[key] = ex
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def chatbot():
+    """Create a chatbot backed by a real client with a mocked API."""
+    with patch('ai_client.genai.Client'):
+        client = GeminiAIClient(api_key="test_key")
+    client.chat_with_sentiment = Mock(return_value={
+        "sentiment": "positive",
+        "confidence": 0.9,
+        "emotion": "happy",
+        "emotion_intensity": "high",
+        "reasoning": "Greeting",
+        "reply": "Hello!"
+    })
+    return SmartChatbot(ai_client=client)
+
+
+class TestInMemorySessionStore:
+    """Test suite for the process-local store."""
+
+    def test_round_trip(self, chatbot):
+        """Test that the same object comes back."""
+        store = InMemorySessionStore()
+        store.save("abc", chatbot)
+
+        assert store.get("abc") is chatbot
+        store.delete("abc")
+        assert store.get("abc") is None
+
+    def test_least_recently_used_evicted(self):
+        """Test that the store never holds more than max_sessions chatbots."""
+        store = InMemorySessionStore(max_sessions=2)
+        store.save("a", "bot a")
+        store.save("b", "bot b")
+        store.get("a")
+        store.save("c", "bot c")
+
+        assert len(store) == 2
+        assert store.get("b") is None
+        assert store.get("a") == "bot a"
+
+    def test_idle_session_expires(self):
+        """Test that sessions past their TTL are dropped."""
+        store = InMemorySessionStore(ttl=-1)
+        store.save("a", "bot a")
+
+        assert store.get("a") is None
+        assert len(store) == 0
+
+    def test_lock_wait_times_out(self):
+        """Test that a held session lock makes others give up instead of waiting forever."""
+        store = InMemorySessionStore(lock_timeout=0.01)
+        assert store.lock("abc").acquire()
+
+        assert not store.lock("abc").acquire()
+        store.lock("abc").release()
+        assert store.lock("abc").acquire()
+
+    def test_lock_per_session(self):
+        """Test that each session gets one reusable lock."""
+        store = InMemorySessionStore()
+
+        assert store.lock("abc") is store.lock("abc")
+        assert store.lock("abc") is not store.lock("xyz")
+
+
+class TestRedisSessionStore:
+    """Test suite for the Redis-backed store."""
+
+    def test_round_trip_keeps_conversation(self, chatbot):
+        """Test that a pickled chatbot restores its history and counters."""
+        store = RedisSessionStore(FakeRedis(), ttl=60)
+        chatbot.chat("Hi")
+        store.save("abc", chatbot)
+
+        restored = store.get("abc")
+
+        assert restored.get_history() == chatbot.get_history()
+        assert restored.get_statistics()["user_messages"] == 1
+        assert list(restored.previous_moods) == ["positive"]
+        assert store.client.ttls["cb:abc"] == 60
+
+    def test_roles_work_after_round_trip(self, chatbot):
+        """Test that role checks still match on a chatbot restored from Redis."""
+        store = RedisSessionStore(FakeRedis())
+        chatbot.chat("Hi")
+        store.save("abc", chatbot)
+
+        restored = store.get("abc")
+        restored.bind_client(chatbot.ai_client)
+        restored.set_personality("You are a pirate.")
+        restored.chat("Ahoy")
+
+        assert restored.get_history()[0]["content"] == "You are a pirate."
+        sent = chatbot.ai_client.chat_with_sentiment.call_args[1]["conversation_history"]
+        assert sent[0] == {"role": "system", "content": "You are a pirate."}
+
+    def test_client_not_pickled(self, chatbot):
+        """Test that the AI client is dropped and can be rebound."""
+        store = RedisSessionStore(FakeRedis())
+        analytics = chatbot.analytics
+        store.save("abc", chatbot)
+
+        restored = store.get("abc")
+        assert restored.ai_client is None
+        assert restored.sentiment_analyzer.ai_client is None
+        assert chatbot.analytics is analytics
+
+        restored.bind_client(chatbot.ai_client)
+        assert restored.analytics.ai_client is chatbot.ai_client
+        restored.chat("Again")
+        assert restored.get_statistics()["user_messages"] == 1
+
+    def test_get_restarts_expiry(self, chatbot):
+        """Test that reading a session keeps it alive like saving it does."""
+        store = RedisSessionStore(FakeRedis(), ttl=60)
+        store.save("abc", chatbot)
+        store.client.ttls["cb:abc"] = 5
+
+        store.get("abc")
+
+        assert store.client.ttls["cb:abc"] == 60
+
+    def test_missing_session(self):
+        """Test that an unknown session returns None."""
+        assert RedisSessionStore(FakeRedis()).get("nope") is None
+
+    def test_results_keyed_by_state(self, chatbot):
+        """Test that saved results are shared until the chatbot state changes."""
+        store = RedisSessionStore(FakeRedis(), ttl=60)
+        store.save("abc", chatbot)
+        state_key = chatbot.state_key
+
+        assert store.get_result("abc", state_key, "summary") is None
+        store.save_result("abc", state_key, "summary", b'{"summary":"Hi"}')
+
+        assert store.get_result("abc", store.get("abc").state_key, "summary") == b'{"summary":"Hi"}'
+        assert store.client.ttls[f"cb:abc:summary:{state_key}"] == 60
+
+        chatbot.chat("Hi")
+        assert store.get_result("abc", chatbot.state_key, "summary") is None
+
+    def test_lock_shared_through_redis(self):
+        """Test that session locks are Redis locks keyed by session."""
+        client = Mock()
+        RedisSessionStore(client).lock("abc")
+
+        assert client.lock.call_args[0][0] == "lock:cb:abc"
+
+
+class TestCreateSessionStore:
+    """Test suite for backend selection."""
+
+    def test_defaults_to_memory(self):
+        """Test that no Redis URL keeps sessions in process."""
+        assert isinstance(create_session_store(None), InMemorySessionStore)
+
+    def test_redis_url_without_package(self):
+        """Test a clear error when Redis is configured but not installed."""
+        with patch('session_store.redis', None):
+            with pytest.raises(RuntimeError):
+                create_session_store("redis://localhost:6379/0")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
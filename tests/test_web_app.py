@@ -0,0 +1,233 @@
+"""
+Unit tests for Web Application Module.
+Tests the Flask routes with a mocked AI client and an in-memory session store.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with patch("ai_client.genai.Client"):
+    import web_app
+
+from ai_client import AIClientError
+from chatbot import SmartChatbot
+from session_store import InMemorySessionStore, RedisSessionStore
+from tests.test_session_store import FakeRedis
+
+
+@pytest.fixture
+def mock_ai_client():
+    """Create a mock AI client."""
+    client = Mock()
+    client.analyze_sentiment.return_value = {
+        "sentiment": "positive",
+        "confidence": 0.9,
+        "emotion": "happy",
+        "emotion_intensity": "high",
+        "reasoning": "User is happy"
+    }
+    client.generate_reply.return_value = "That's great to hear!"
+    client.generate_reply_stream.side_effect = lambda **kwargs: iter(["That's ", "great!"])
+    return client
+
+
+@pytest.fixture
+def client(monkeypatch, mock_ai_client):
+    """Create a Flask test client with a fresh session store and no job queue."""
+    monkeypatch.setattr(web_app, "ai_client", mock_ai_client)
+    monkeypatch.setattr(web_app, "session_store", InMemorySessionStore())
+    monkeypatch.setattr(web_app, "job_queue", None)
+    web_app.app.testing = True
+    return web_app.app.test_client()
+
+
+def session_id(client):
+    """Open the index page and return the session id it assigned."""
+    client.get("/")
+    with client.session_transaction() as session:
+        return session["session_id"]
+
+
+class TestChatStream:
+    """Test suite for the /chat/stream route."""
+
+    def test_stream_events(self, client):
+        """Test that fragments arrive as data events followed by a done event."""
+        response = client.post("/chat/stream", json={"message": "I'm so happy!"})
+        body = response.get_data(as_text=True)
+
+        assert response.mimetype == "text/event-stream"
+        assert 'data: {"delta":"That\'s "}' in body
+        assert "event: done" in body
+        assert client.get("/stats").get_json()["user_messages"] == 1
+
+    def test_lock_held_until_stream_closes(self, client):
+        """Test that the session lock is handed to the response and released on close."""
+        sid = session_id(client)
+
+        response = client.post("/chat/stream", json={"message": "Hi"}, buffered=False)
+        assert web_app.session_store.lock(sid).locked()
+
+        response.close()
+        assert not web_app.session_store.lock(sid).locked()
+
+    def test_disconnect_keeps_history_paired(self, client):
+        """Test that a client leaving mid-stream still records the partial reply."""
+        sid = session_id(client)
+
+        response = client.post("/chat/stream", json={"message": "Hi"}, buffered=False)
+        next(response.response)
+        response.close()
+
+        history = client.get("/history").get_json()["history"]
+        assert [m["role"] for m in history[-2:]] == ["user", "assistant"]
+        assert history[-1]["content"] == "That's"
+        assert not web_app.session_store.lock(sid).locked()
+
+
+class TestErrorHandling:
+    """Test suite for request validation and error responses."""
+
+    @pytest.fixture(autouse=True)
+    def no_combined_reply(self, mock_ai_client):
+        """Answer through generate_reply so tests can make it fail."""
+        mock_ai_client.chat_with_sentiment.side_effect = AIClientError("unused")
+
+    @pytest.mark.parametrize("kwargs", [
+        {"data": "not json", "content_type": "application/json"},
+        {"json": {"message": "   "}},
+        {"json": {}},
+        {"json": "hi"},
+        {"json": ["hi"]},
+        {"json": {"message": None}},
+        {"json": {"message": 5}},
+    ])
+    def test_invalid_or_empty_message(self, client, kwargs):
+        """Test that a bad body is rejected with 400 before reaching the AI."""
+        response = client.post("/chat", **kwargs)
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Message cannot be empty"}
+
+    def test_ai_failure_returns_502(self, client, mock_ai_client):
+        """Test that AI client errors map to 502 without leaking the cause."""
+        mock_ai_client.generate_reply.side_effect = AIClientError("quota exceeded for key abc123")
+
+        response = client.post("/chat", json={"message": "Hi"})
+
+        assert response.status_code == 502
+        assert response.get_json() == {"error": "The AI service is unavailable, please try again"}
+        assert b"abc123" not in response.data
+
+    def test_unexpected_failure_returns_500(self, client, mock_ai_client):
+        """Test that other errors map to 500 without leaking the cause."""
+        mock_ai_client.generate_reply.side_effect = RuntimeError("/srv/secret/path")
+
+        response = client.post("/chat", json={"message": "Hi"})
+
+        assert response.status_code == 500
+        assert response.get_json() == {"error": "Something went wrong, please try again"}
+        assert b"secret" not in response.data
+
+    def test_http_errors_pass_through(self, client):
+        """Test that routing errors keep their own status instead of becoming 500."""
+        assert client.get("/no-such-page").status_code == 404
+        assert client.get("/chat").status_code == 405
+
+    def test_lock_released_after_error(self, client, mock_ai_client):
+        """Test that a failed /chat request doesn't leave the session locked."""
+        sid = session_id(client)
+        mock_ai_client.generate_reply.side_effect = RuntimeError("boom")
+
+        assert client.post("/chat", json={"message": "Hi"}).status_code == 500
+        assert client.post("/chat", json={"message": ""}).status_code == 400
+        assert not web_app.session_store.lock(sid).locked()
+
+        mock_ai_client.generate_reply.side_effect = None
+        assert client.post("/chat", json={"message": "Hi"}).status_code == 200
+
+    def test_busy_session_returns_503(self, client, monkeypatch):
+        """Test that a request gives up on a session still locked by a hung turn."""
+        monkeypatch.setattr(web_app, "session_store", InMemorySessionStore(lock_timeout=0.01))
+        sid = session_id(client)
+        web_app.session_store.lock(sid).acquire()
+
+        response = client.post("/chat", json={"message": "Hi"})
+
+        assert response.status_code == 503
+        assert response.get_json() == {"error": "Session is busy, please retry"}
+
+    def test_stream_error_event(self, client, mock_ai_client):
+        """Test that a failure mid-stream ends with a generic error event and unlocks."""
+        sid = session_id(client)
+        mock_ai_client.generate_reply_stream.side_effect = AIClientError("key abc123 revoked")
+
+        response = client.post("/chat/stream", json={"message": "Hi"})
+        body = response.get_data(as_text=True)
+        response.close()
+
+        assert "event: error" in body
+        assert "abc123" not in body
+        assert not web_app.session_store.lock(sid).locked()
+
+
+class TestSharedResults:
+    """Test suite for AI results reused across requests with the Redis store."""
+
+    @pytest.fixture
+    def redis_client(self, monkeypatch, client, mock_ai_client):
+        """Back the app with a fake Redis holding one conversation; return the test client."""
+        monkeypatch.setattr(web_app, "session_store", RedisSessionStore(FakeRedis()))
+        mock_ai_client.summarize_conversation.return_value = {"summary": "A greeting"}
+        mock_ai_client.generate_trend_analysis.return_value = {"trend": "stable"}
+
+        chatbot = SmartChatbot(ai_client=mock_ai_client)
+        chatbot.chat("Hi")
+        web_app.session_store.save("abc", chatbot)
+        with client.session_transaction() as session:
+            session["session_id"] = "abc"
+        return client
+
+    def test_polling_reuses_result(self, redis_client, mock_ai_client):
+        """Test that repeated polls make one AI call even though each unpickles the chatbot."""
+        bodies = [redis_client.get("/summary").data for _ in range(3)]
+        redis_client.get("/trends")
+        redis_client.get("/trends")
+
+        assert bodies[0] == bodies[1] == bodies[2]
+        assert mock_ai_client.summarize_conversation.call_count == 1
+        assert mock_ai_client.generate_trend_analysis.call_count == 1
+
+    def test_new_turn_recomputes(self, redis_client, mock_ai_client):
+        """Test that a result isn't reused once the conversation changes."""
+        redis_client.get("/summary")
+
+        chatbot = web_app.session_store.get("abc")
+        chatbot.bind_client(mock_ai_client)
+        chatbot.chat("Still there?")
+        web_app.session_store.save("abc", chatbot)
+        redis_client.get("/summary")
+
+        assert mock_ai_client.summarize_conversation.call_count == 2
+
+    def test_queued_route_serves_worker_result(self, redis_client, monkeypatch):
+        """Test that a result the worker saved is returned without queueing another job."""
+        enqueue = Mock(return_value="job1")
+        monkeypatch.setattr(web_app, "job_queue", Mock())
+        monkeypatch.setattr(web_app, "enqueue_result", enqueue)
+        state_key = web_app.session_store.get("abc").state_key
+
+        response = redis_client.get("/summary")
+        assert response.status_code == 202
+        enqueue.assert_called_once_with(web_app.job_queue, "abc", state_key, "summary")
+
+        web_app.session_store.save_result("abc", state_key, "summary", b'{"summary":"Done"}')
+        response = redis_client.get("/summary")
+
+        assert response.status_code == 200
+        assert response.data == b'{"summary":"Done"}'
+        assert enqueue.call_count == 1
@@ -8,6 +8,12 @@ import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+# Optional fast JSON encoder for dumps_json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def format_timestamp(dt: datetime = None) -> str:
     """
@@ -268,6 +274,24 @@ def extract_json_from_text(text: str) -> Optional[Dict]:
     return None
 
 
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, using orjson when it is installed.
+    
+    Args:
+        data: JSON-compatible data (unknown types are converted with str)
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=str, option=option)
+    return json.dumps(data, indent=2 if indent else None,
+                      ensure_ascii=False, default=str).encode("utf-8")
+
+
 def safe_get(dictionary: Dict, *keys, default=None):
     """
     Safely get a nested value from a dictionary.
@@ -341,11 +365,11 @@ class ConversationLogger:
         
         filepath = os.path.join(self.log_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump({
+        with open(filepath, 'wb') as f:
+            f.write(dumps_json({
                 "timestamp": format_timestamp(),
                 "messages": history
-            }, f, indent=2, ensure_ascii=False)
+            }, indent=True))
         
         return filepath
     
@@ -3,187 +3,444 @@ Web Application for AI Chatbot - Flask-based web interface.
 Powered by Google Gemini Flash 2.5
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, g, stream_with_context, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException
+from jinja2 import FileSystemBytecodeCache
 import os
-import secrets
 
 from chatbot import SmartChatbot
-from analytics import ConversationAnalytics, ReportGenerator
-from ai_client import GeminiAIClient
+from ai_client import GeminiAIClient, AIClientError
+from config import FLASK_SECRET_KEY, SESSION_TTL_SECONDS
+from session_store import RedisSessionStore, create_session_store
+from response_cache import create_response_cache
+from jobs import create_job_queue, enqueue_result, fetch_result
+from utils import dumps_json
+
+# Optional fast JSON encoder for all jsonify() responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional server-side Flask sessions, used together with the Redis session store
+try:
+    from flask_session import Session as FlaskSession
+except ImportError:
+    FlaskSession = None
+
+# Optional gzip/brotli compression of JSON responses
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson; decoding is unchanged."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj).decode("utf-8")
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+    
+    def _encode(self, obj) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
 
 app = Flask(__name__)
-app.secret_key = secrets.token_hex(16)
+# A fixed key keeps session cookies valid across restarts and between workers
+app.secret_key = FLASK_SECRET_KEY or os.urandom(32)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+app.json.compact = True  # No pretty-printing, even under the debug server
+# Templates compile once per process and the compiled code is shared between workers
+# and restarts. TEMPLATES_AUTO_RELOAD stays unset, so reloading follows debug mode.
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# /graph body before any messages, encoded once
+_EMPTY_GRAPH_BYTES = dumps_json({
+    'graph': '📊 No conversation data yet.\n\nStart chatting to see your mood graph!\n\nThe graph will show:\n• Your emotional journey over time\n• Sentiment trends (positive/neutral/negative)\n• Visual representation of mood shifts'
+})
+_GRAPH_ERROR_BYTES = dumps_json({
+    'graph': 'Error generating graph.\n\nPlease try again after sending a few messages.'
+})
+
+# Error bodies for unexpected failures, encoded once; details go to the log only
+_INTERNAL_ERROR_BYTES = dumps_json({'error': 'Something went wrong, please try again'})
+_AI_ERROR_BYTES = dumps_json({'error': 'The AI service is unavailable, please try again'})
+
+
+class ChatError(Exception):
+    """Error caused by the request, reported to the browser with its message and status."""
+    status_code = 400
+
+
+class EmptyMessageError(ChatError):
+    """The message to send was blank."""
+    
+    def __init__(self):
+        super().__init__('Message cannot be empty')
+
+
+class JobNotFoundError(ChatError):
+    """The polled job is unknown, expired, or belongs to another session."""
+    status_code = 404
+    
+    def __init__(self):
+        super().__init__('Job not found or expired')
+
 
-# Global storage for chatbot instances (in production, use Redis/database)
-chatbot_instances = {}
+class SessionBusyError(ChatError):
+    """Another request is still changing this session's chatbot."""
+    status_code = 503
+    
+    def __init__(self):
+        super().__init__('Session is busy, please retry')
+
+# One Gemini client shared by every session, so its connection pool is reused
+ai_client = GeminiAIClient()
+
+# Chatbot per session: process memory, or Redis when REDIS_URL is set
+session_store = create_session_store()
+
+# With Redis available, keep Flask sessions server-side in the same instance
+if isinstance(session_store, RedisSessionStore) and FlaskSession is not None:
+    app.config.update(
+        SESSION_TYPE='redis',
+        SESSION_REDIS=session_store.client,
+        SESSION_PERMANENT=False,
+        PERMANENT_SESSION_LIFETIME=SESSION_TTL_SECONDS
+    )
+    FlaskSession(app)
+elif isinstance(session_store, RedisSessionStore) and not FLASK_SECRET_KEY:
+    # Each process signs cookies with its own random key, so other workers reject them
+    app.logger.warning(
+        "REDIS_URL is set without FLASK_SECRET_KEY or Flask-Session: "
+        "sessions only work while every request reaches this one process."
+    )
+
+# Reports and histories repeat the same keys on every entry and compress well.
+# Only JSON is compressed, so /chat/stream events are never buffered by the encoder.
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=['application/json'],
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_MIN_SIZE=1024
+    )
+    Compress(app)
+
+# Semantic cache of replies shared by all sessions (None unless enabled in config)
+response_cache = create_response_cache()
+
+# RQ queue for the slow AI-backed routes (None: they answer inline)
+job_queue = create_job_queue(session_store)
+
+
+# Rendered index.html, see index()
+_index_html = None
 
 
 def get_chatbot(session_id):
     """Get or create a chatbot instance for the session."""
-    if session_id not in chatbot_instances:
-        chatbot_instances[session_id] = SmartChatbot()
-    return chatbot_instances[session_id]
+    chatbot = session_store.get(session_id)
+    if chatbot is None:
+        chatbot = SmartChatbot(ai_client=ai_client)
+        session_store.save(session_id, chatbot)
+    elif chatbot.ai_client is None:
+        # Loaded from Redis, which stores chatbots without their client
+        chatbot.bind_client(ai_client)
+    chatbot.response_cache = response_cache
+    return chatbot
+
+
+def _parse_body():
+    """Decode the JSON request body once, or return None if it isn't valid JSON."""
+    if orjson is None:
+        return request.get_json(silent=True)
+    try:
+        return orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
+
+
+@app.errorhandler(ChatError)
+def handle_chat_error(e):
+    """Report a request error with its own message and status."""
+    return jsonify({'error': str(e)}), e.status_code
+
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Log any other failure and return a fixed error body."""
+    if isinstance(e, HTTPException):
+        return e
+    app.logger.exception("Error handling %s", request.path)
+    if isinstance(e, AIClientError):
+        return app.response_class(_AI_ERROR_BYTES, status=502, mimetype='application/json')
+    return app.response_class(_INTERNAL_ERROR_BYTES, status=500, mimetype='application/json')
+
+
+def _new_session_id():
+    """Start a new session id in the cookie and return it."""
+    session_id = session['session_id'] = os.urandom(8).hex()
+    return session_id
+
+
+def _read_message():
+    """Return the stripped message from the request body, rejecting missing or blank ones."""
+    body = g.body
+    message = body.get('message') if isinstance(body, dict) else None
+    if not isinstance(message, str) or not message.strip():
+        raise EmptyMessageError()
+    return message.strip()
+
+
+@app.before_request
+def load_session_chatbot():
+    """Resolve the session, its chatbot and the request body for API routes."""
+    if request.endpoint in (None, 'index', 'static'):
+        return None
+    
+    g.session_id = session.get('session_id') or _new_session_id()
+    
+    # Polled results are built by the worker from the stored session
+    if request.endpoint == 'get_job':
+        return None
+    
+    if request.method == 'POST':
+        # One change at a time per session, from load until the teardown below.
+        # Both stores stop waiting after SESSION_LOCK_TIMEOUT_SECONDS.
+        lock = session_store.lock(g.session_id)
+        if not lock.acquire():
+            raise SessionBusyError()
+        g.session_lock = lock
+        g.body = _parse_body()
+    
+    g.chatbot = get_chatbot(g.session_id)
+    return None
+
+
+@app.teardown_request
+def release_session_lock(exc):
+    """Release the session lock taken for a POST request."""
+    lock = g.pop('session_lock', None)
+    if lock is not None:
+        lock.release()
 
 
 @app.route('/')
 def index():
     """Render the main chat interface."""
+    global _index_html
     if 'session_id' not in session:
-        session['session_id'] = secrets.token_hex(8)
-    return render_template('index.html')
+        _new_session_id()
+    # The page has no per-request content, so it is rendered once (every time when debugging)
+    if _index_html is None or app.debug:
+        _index_html = render_template('index.html')
+    return _index_html
 
 
 @app.route('/chat', methods=['POST'])
 def chat():
     """Handle chat messages."""
-    try:
-        data = request.json
-        message = data.get('message', '').strip()
-        
-        if not message:
-            return jsonify({'error': 'Message cannot be empty'}), 400
-        
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        
-        # Get response from chatbot
-        result = chatbot.chat(message)
-        
-        return jsonify({
-            'response': result['response'],
-            'sentiment': result['sentiment'],
-            'mood_shift': result.get('mood_shift_detected'),
-            'ui_hints': result.get('ui_hints', {}),
-            'state': result.get('state', {})
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    message = _read_message()
+    
+    # Get response from chatbot
+    result = g.chatbot.chat(message)
+    session_store.save(g.session_id, g.chatbot)
+    
+    return jsonify(_chat_payload(result))
+
+
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    Handle chat messages, streaming the reply as Server-Sent Events.
+    Sends a 'data' event per reply fragment ({"delta": ...}), then a 'done'
+    event with the /chat payload, or an 'error' event if the turn fails.
+    """
+    message = _read_message()
+    
+    def events():
+        try:
+            for event in g.chatbot.chat_stream(message):
+                if 'delta' in event:
+                    yield b'data: ' + dumps_json(event) + b'\n\n'
+                else:
+                    session_store.save(g.session_id, g.chatbot)
+                    yield b'event: done\ndata: ' + dumps_json(_chat_payload(event['result'])) + b'\n\n'
+        except Exception as e:
+            # Headers are already sent, so report the failure as the last event
+            app.logger.exception("Error streaming %s", request.path)
+            body = _AI_ERROR_BYTES if isinstance(e, AIClientError) else _INTERNAL_ERROR_BYTES
+            yield b'event: error\ndata: ' + body + b'\n\n'
+    
+    response = app.response_class(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Teardown runs before the body is sent; keep the session locked until the stream closes
+    response.call_on_close(g.pop('session_lock').release)
+    return response
+
+
+def _chat_payload(result):
+    """Pick the fields of a chatbot turn that /chat returns to the browser."""
+    return {
+        'response': result['response'],
+        'sentiment': result['sentiment'],
+        'mood_shift': result.get('mood_shift_detected'),
+        'ui_hints': result.get('ui_hints', {}),
+        'state': result.get('state', {})
+    }
+
+
+def _stored_result(kind):
+    """Return the body a worker already built for this chatbot state, or None."""
+    return session_store.get_result(g.session_id, g.chatbot.state_key, kind)
+
+
+def _store_result(kind, body):
+    """Share a freshly built body with later requests for the same chatbot state."""
+    session_store.save_result(g.session_id, g.chatbot.state_key, kind, body)
+    return body
 
 
 @app.route('/stats', methods=['GET'])
 def get_stats():
     """Get conversation statistics."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        stats = chatbot.get_statistics()
-        return jsonify(stats)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    body = g.chatbot.get_json('stats')
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.route('/summary', methods=['GET'])
 def get_summary():
     """Get AI-generated conversation summary."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        summary = chatbot.get_conversation_summary()
-        return jsonify(summary)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if job_queue is not None:
+        return _enqueue('summary')
+    body = _stored_result('summary') or _store_result('summary', g.chatbot.get_json('summary'))
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.route('/keywords', methods=['GET'])
 def get_keywords():
     """Get AI-extracted keywords."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        keywords = chatbot.get_keywords()
-        return jsonify(keywords)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if job_queue is not None:
+        return _enqueue('keywords')
+    body = _stored_result('keywords') or _store_result('keywords', g.chatbot.get_json('keywords'))
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.route('/trends', methods=['GET'])
 def get_trends():
     """Get sentiment trend analysis."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        analytics = ConversationAnalytics(chatbot.ai_client)
-        sentiment_history = chatbot.get_sentiment_history()
-        trends = analytics.analyze_trends(sentiment_history)
-        return jsonify(trends.to_dict())
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    body = _stored_result('trends')
+    if body is None:
+        chatbot = g.chatbot
+        trends = chatbot.analytics.analyze_trends(chatbot.get_sentiment_history())
+        body = _store_result('trends', dumps_json(trends.to_dict()))
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.route('/graph', methods=['GET'])
 def get_graph():
     """Get ASCII mood graph."""
     try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
+        chatbot = g.chatbot
         sentiment_history = chatbot.get_sentiment_history()
         
         if not sentiment_history:
-            return jsonify({
-                'graph': '📊 No conversation data yet.\n\nStart chatting to see your mood graph!\n\nThe graph will show:\n• Your emotional journey over time\n• Sentiment trends (positive/neutral/negative)\n• Visual representation of mood shifts'
-            })
+            return app.response_class(_EMPTY_GRAPH_BYTES, mimetype='application/json')
         
-        analytics = ConversationAnalytics(chatbot.ai_client)
-        graph = analytics.generate_mood_graph(sentiment_history)
-        return jsonify({'graph': graph})
-    except Exception as e:
-        return jsonify({'graph': f'Error generating graph: {str(e)}\n\nPlease try again after sending a few messages.'}), 200
+        body = _stored_result('graph')
+        if body is None:
+            graph = chatbot.analytics.generate_mood_graph(sentiment_history)
+            body = dumps_json({'graph': graph})
+            # A fallback drawing is cheap and the next request should try the AI again
+            if graph != chatbot.ai_client.fallback_mood_graph(sentiment_history):
+                _store_result('graph', body)
+        return app.response_class(body, mimetype='application/json')
+    except Exception:
+        # The graph panel shows this text in place of a graph
+        app.logger.exception("Error generating mood graph")
+        return app.response_class(_GRAPH_ERROR_BYTES, mimetype='application/json')
 
 
 @app.route('/profile', methods=['GET'])
 def get_profile():
     """Get emotion profile."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        analytics = ConversationAnalytics(chatbot.ai_client)
-        sentiment_history = chatbot.get_sentiment_history()
-        profile = analytics.generate_emotion_profile(sentiment_history)
-        return jsonify({'profile': profile})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    body = _stored_result('profile')
+    if body is None:
+        chatbot = g.chatbot
+        profile = chatbot.analytics.generate_emotion_profile(chatbot.get_sentiment_history())
+        body = _store_result('profile', dumps_json({'profile': profile}))
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.route('/report', methods=['GET'])
 def get_report():
     """Get full analytics report."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        analytics = ConversationAnalytics(chatbot.ai_client)
-        report_gen = ReportGenerator(analytics)
+    if job_queue is not None:
+        return _enqueue('report')
+    report = _stored_result('report')
+    if report is None:
+        chatbot = g.chatbot
+        report_gen = chatbot.report_generator
         
         conversation_history = chatbot.get_history()
         sentiment_history = chatbot.get_sentiment_history()
         
-        report = report_gen.generate_json_report(conversation_history, sentiment_history)
-        return jsonify(report)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        report = _store_result('report', report_gen.generate_json_bytes(conversation_history, sentiment_history))
+    return app.response_class(report, mimetype='application/json')
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a result queued by /report, /summary or /keywords."""
+    if job_queue is None:
+        raise JobNotFoundError()
+    
+    status, result = fetch_result(job_queue, job_id, g.session_id)
+    if status == 'finished':
+        return app.response_class(result, mimetype='application/json')
+    if status == 'pending':
+        return jsonify({'job_id': job_id, 'status_url': request.path}), 202
+    if status == 'failed':
+        return app.response_class(_INTERNAL_ERROR_BYTES, status=500, mimetype='application/json')
+    raise JobNotFoundError()
+
+
+def _enqueue(kind):
+    """Return a result the worker already built, or queue one and point the client at it."""
+    body = _stored_result(kind)
+    if body is not None:
+        return app.response_class(body, mimetype='application/json')
+    job_id = enqueue_result(job_queue, g.session_id, g.chatbot.state_key, kind)
+    return jsonify({'job_id': job_id, 'status_url': url_for('get_job', job_id=job_id)}), 202
 
 
 @app.route('/reset', methods=['POST'])
 def reset_chat():
     """Reset the conversation."""
-    try:
-        session_id = session.get('session_id', 'default')
-        if session_id in chatbot_instances:
-            chatbot_instances[session_id].reset()
-        return jsonify({'status': 'success', 'message': 'Conversation reset'})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    g.chatbot.reset()
+    session_store.save(g.session_id, g.chatbot)
+    return jsonify({'status': 'success', 'message': 'Conversation reset'})
 
 
 @app.route('/history', methods=['GET'])
 def get_history():
     """Get conversation history."""
-    try:
-        session_id = session.get('session_id', 'default')
-        chatbot = get_chatbot(session_id)
-        history = chatbot.get_history()
-        return jsonify({'history': history})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    body = g.chatbot.get_json('history')
+    return app.response_class(body, mimetype='application/json')
 
 
 if __name__ == '__main__':
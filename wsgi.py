@@ -0,0 +1,8 @@
+"""
+WSGI entry point for production servers.
+Run with: gunicorn wsgi:application (settings are read from gunicorn.conf.py)
+"""
+
+from web_app import app
+
+application = app